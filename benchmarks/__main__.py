@@ -0,0 +1,135 @@
+"""Runs the benchmark suite, and compares the results with a baseline.
+
+The time of every benchmark in ``benchmarks.suite`` is printed next to
+its time in the baseline, and benchmarks that got slower by more than
+the threshold are reported as regressions. Results are saved as JSON,
+and can be saved as the new baseline.
+
+Run with ``python -m benchmarks``. Pass ``--save-baseline`` to store the
+results as the baseline, and ``--output results.json`` to keep them
+elsewhere. Timings depend on the machine, so the baseline should be
+recorded on the machine it is compared on.
+"""
+
+import json
+import platform
+import sys
+from argparse import ArgumentParser
+from datetime import datetime, timezone
+
+from benchmarks.suite import benchmarks, measure
+
+BASELINE_PATH = "benchmarks/baseline.json"
+
+
+def run(name_filter: str | None = None) -> dict:
+    """Runs the benchmarks whose name contains ``name_filter``.
+
+    Returns
+    -------
+    dict
+        The results, as they are saved to JSON.
+    """
+    results = {}
+    for name, function in benchmarks().items():
+        if name_filter and name_filter not in name:
+            continue
+
+        results[name] = measure(function)
+        print(f"{name:<60} {results[name]['median'] * 1e6:12.2f} us", flush=True)
+
+    return {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Prints the results next to the baseline.
+
+    Parameters
+    ----------
+    results : dict
+        The results of this run.
+    baseline : dict
+        The stored results to compare with.
+    threshold : float
+        How much slower, as a fraction of the baseline time,
+        a benchmark has to be to count as a regression.
+
+    Returns
+    -------
+    list[str]
+        The names of the benchmarks that regressed.
+    """
+    regressions = []
+    print(
+        f"\n{'benchmark':<60} {'baseline (us)':>14} {'current (us)':>13} "
+        f"{'ratio':>7}"
+    )
+    for name, result in results["results"].items():
+        if name not in baseline["results"]:
+            print(f"{name:<60} {'-':>14} {result['median'] * 1e6:13.2f}")
+            continue
+
+        old = baseline["results"][name]["median"]
+        ratio = result["median"] / old
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  regression"
+            regressions.append(name)
+        elif ratio < 1 - threshold:
+            flag = "  improvement"
+
+        print(
+            f"{name:<60} {old * 1e6:14.2f} {result['median'] * 1e6:13.2f} "
+            f"{ratio:7.2f}{flag}"
+        )
+
+    return regressions
+
+
+def main():
+    parser = ArgumentParser(description="Run the benchmark suite.")
+    parser.add_argument("--filter", help="only run benchmarks containing this")
+    parser.add_argument("--output", help="save the results to this JSON file")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument(
+        "--save-baseline", action="store_true", help="save the results as baseline"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="slowdown, as a fraction, reported as a regression",
+    )
+    args = parser.parse_args()
+
+    results = run(args.filter)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=4)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=4)
+        return
+
+    try:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+    except FileNotFoundError:
+        print(f"\nNo baseline at {args.baseline}, run with --save-baseline")
+        return
+
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} benchmarks regressed")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
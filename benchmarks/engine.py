@@ -0,0 +1,71 @@
+"""Benchmarks the throughput of the sound engine loop without an audio device.
+
+Runs the SoundEngine with many monsters against the null synth backend,
+and with the recording backend to check the recorded event rate.
+
+Run with ``python -m benchmarks.engine``.
+"""
+
+from time import perf_counter
+
+from src.clock import Clock
+from src.monsters.euclideanmonster import ThumpFoot
+from src.monsters.fractalmonster import EtherealEcho, HummingVenus
+from src.soundengine.backend import (
+    NOTE_ON,
+    NullBackend,
+    RecordingBackend,
+    SynthBackend,
+)
+from src.soundengine.soundengine import SoundEngine
+
+MONSTER_COUNTS = [10, 100, 1000]
+MONSTER_TYPES = [EtherealEcho, HummingVenus, ThumpFoot]
+SECONDS = 2.0
+BPM = 480
+
+
+def run(synth: SynthBackend, monster_count: int) -> tuple[float, int]:
+    engine = SoundEngine(synth, Clock(BPM, 4, 4), lookahead_beats=2.0)
+    engine.select_programs()
+
+    for monster_id in range(monster_count):
+        monster_type = MONSTER_TYPES[monster_id % len(MONSTER_TYPES)]
+        position = ((monster_id % 97) / 97, (monster_id % 89) / 89)
+        engine.monsters[monster_id] = monster_type(position)
+        engine.monsters[monster_id].initialize(0.0)
+
+    iterations = 0
+    start = perf_counter()
+    while perf_counter() - start < SECONDS:
+        current_beat = engine.generate()
+        engine.release(current_beat)
+        engine.trigger(current_beat)
+        engine.refill()
+        iterations += 1
+
+    return perf_counter() - start, iterations
+
+
+def main():
+    print(f"{'backend':>10} {'monsters':>9} {'iters/s':>10} {'notes/s':>10}")
+    for monster_count in MONSTER_COUNTS:
+        synth = NullBackend()
+        elapsed, iterations = run(synth, monster_count)
+        print(
+            f"{'null':>10} {monster_count:>9} {iterations / elapsed:>10.0f}"
+            f" {synth.noteons / elapsed:>10.0f}"
+        )
+
+        synth = RecordingBackend()
+        elapsed, iterations = run(synth, monster_count)
+        events = synth.recorded()
+        noteons = (events["kind"] == NOTE_ON).sum()
+        print(
+            f"{'recording':>10} {monster_count:>9} {iterations / elapsed:>10.0f}"
+            f" {noteons / elapsed:>10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Benchmarks running sounds through the plugin chains of the monsters.
+
+Compares calling ``transform`` of every plugin once per sound with
+transforming blocks of sounds with ``transform_batch``.
+
+Run with ``python -m benchmarks.generation``.
+"""
+
+from time import perf_counter
+
+from src.monsters import BLOCK_SIZE, Monster
+from src.soundengine.scene import MONSTER_TYPES
+
+SOUNDS = 20000
+
+
+def run_scalar(monster: Monster) -> float:
+    start = perf_counter()
+    for _ in range(SOUNDS):
+        note = 0.0
+        duration = 0.0
+        rest = 0.0
+
+        for plugin in monster.plugins:
+            note, duration, rest = plugin.transform(note, duration, rest)
+
+    return (perf_counter() - start) / SOUNDS
+
+
+def run_batch(monster: Monster, block_size: int) -> float:
+    start = perf_counter()
+    for _ in range(SOUNDS // block_size):
+        monster.transform_block(block_size)
+
+    return (perf_counter() - start) / SOUNDS
+
+
+def main():
+    block_sizes = sorted({BLOCK_SIZE, 256})
+
+    print(
+        f"{'monster':>14} {'scalar (us)':>12}"
+        + "".join(f" {f'block {size} (us)':>15}" for size in block_sizes)
+    )
+    for name, monster_type in MONSTER_TYPES.items():
+        scalar_time = run_scalar(monster_type((0.5, 0.5))) * 1e6
+        batch_times = [
+            run_batch(monster_type((0.5, 0.5)), size) * 1e6 for size in block_sizes
+        ]
+
+        print(
+            f"{name:>14} {scalar_time:>12.2f}"
+            + "".join(f" {batch_time:>15.2f}" for batch_time in batch_times)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Benchmarks the memory taken by each monster in a large scene.
+
+Fills a MonsterRepository with many monsters of each type, and reports
+the memory allocated per monster right after creating them, and once
+they have filled their lookahead buffers.
+
+Run with ``python -m benchmarks.monsters``.
+"""
+
+import gc
+import tracemalloc
+from time import perf_counter
+
+from src.clock import Clock
+from src.monsters.monsterrepository import MonsterRepository
+from src.soundengine.scene import MONSTER_TYPES
+
+MONSTER_COUNT = 10000
+LOOKAHEAD_BEATS = 8.0
+
+
+def run(monster_type) -> tuple[float, float, float]:
+    # The first monster of a type fills the caches shared by all of them
+    monster_type((0.5, 0.5)).generate_next_sound(Clock(80, 4, 4), LOOKAHEAD_BEATS)
+
+    gc.collect()
+    tracemalloc.start()
+
+    start = perf_counter()
+    repository = MonsterRepository()
+    for monster_id in range(MONSTER_COUNT):
+        position = ((monster_id % 97) / 97, (monster_id % 89) / 89)
+        repository.add_monster(monster_type(position))
+    elapsed = perf_counter() - start
+
+    created, _ = tracemalloc.get_traced_memory()
+
+    clock = Clock(80, 4, 4)
+    for monster in repository.monsters.values():
+        monster.initialize(0.0)
+        monster.generate_next_sound(clock, LOOKAHEAD_BEATS)
+
+    generated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return (
+        created / MONSTER_COUNT,
+        generated / MONSTER_COUNT,
+        elapsed / MONSTER_COUNT,
+    )
+
+
+def main():
+    print(f"{MONSTER_COUNT} monsters of each type")
+    print(
+        f"{'monster':>13} {'created (B)':>12} {'generated (B)':>14} "
+        f"{'create (us)':>12}"
+    )
+    for name, monster_type in MONSTER_TYPES.items():
+        created, generated, elapsed = run(monster_type)
+        print(f"{name:>13} {created:12.0f} {generated:14.0f} {elapsed * 1e6:12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Benchmarks the generation of Morse-Thue values.
+
+Compares calling ``morse_thue_value`` once per value with stepping a
+``DigitSumCounter`` and with generating blocks of values with
+``morse_thue_block``, and checks that they all give the same values.
+
+Run with ``python -m benchmarks.morsethue``.
+"""
+
+from time import perf_counter
+
+from src.generative.fractal import (
+    DigitSumCounter,
+    morse_thue_block,
+    morse_thue_value,
+)
+
+VALUES = 200000
+BASE = 3
+MULTIPLIER = 33
+BLOCK_SIZES = [16, 64, 256, 1024]
+
+
+def run_scalar() -> tuple[float, list[int]]:
+    start = perf_counter()
+    values = [morse_thue_value(counter, BASE, MULTIPLIER) for counter in range(VALUES)]
+    return ((perf_counter() - start) / VALUES, values)
+
+
+def run_counter() -> tuple[float, list[int]]:
+    counter = DigitSumCounter(BASE, MULTIPLIER)
+    values = []
+
+    start = perf_counter()
+    for _ in range(VALUES):
+        values.append(counter.total)
+        counter.advance()
+
+    return ((perf_counter() - start) / VALUES, values)
+
+
+def run_block(block_size: int) -> tuple[float, list[int]]:
+    values = []
+
+    start = perf_counter()
+    for counter in range(0, VALUES, block_size):
+        count = min(block_size, VALUES - counter)
+        values.extend(morse_thue_block(counter, count, BASE, MULTIPLIER).tolist())
+
+    return ((perf_counter() - start) / VALUES, values)
+
+
+def main():
+    scalar_time, expected = run_scalar()
+    print(f"{'block size':>10} {'ns/value':>10} {'speedup':>8}")
+    print(f"{'scalar':>10} {scalar_time * 1e9:>10.1f} {1:>8.1f}")
+
+    counter_time, values = run_counter()
+    if values != expected:
+        raise AssertionError("Digit sum counter differs from scalar values")
+
+    print(
+        f"{'counter':>10} {counter_time * 1e9:>10.1f} "
+        f"{scalar_time / counter_time:>8.1f}"
+    )
+
+    for block_size in BLOCK_SIZES:
+        block_time, values = run_block(block_size)
+        if values != expected:
+            raise AssertionError(f"Block of {block_size} differs from scalar values")
+
+        print(
+            f"{block_size:>10} {block_time * 1e9:>10.1f} "
+            f"{scalar_time / block_time:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
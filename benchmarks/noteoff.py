@@ -0,0 +1,114 @@
+"""Benchmarks the cost of releasing notes in the sound engine loop.
+
+Compares the old list based store, which updates every held sound on
+every iteration, with the struct of arrays ActiveNotePool, for different
+amounts of held notes.
+
+Run with ``python -m benchmarks.noteoff``.
+"""
+
+from time import perf_counter
+
+from src.soundengine.scheduler import ActiveNotePool
+
+ITERATIONS = 20000
+BEATS_PER_ITERATION = 0.001
+HELD_NOTES = [10, 100, 1000, 5000]
+
+
+class CountingSynth:
+    def __init__(self):
+        self.noteoffs = 0
+
+    def noteoff(self, channel: int, note: int):
+        self.noteoffs += 1
+
+
+class Sound:
+    """A held note of the old list based store, which releases itself
+    when it is updated past its end."""
+
+    __slots__ = ("channel", "velocity", "note", "init", "duration")
+
+    def __init__(
+        self, channel: int, note: int, velocity: int, init: float, duration: float
+    ):
+        self.channel = channel
+        self.velocity = velocity
+        self.note = note
+        self.init = init
+        self.duration = duration
+
+    @property
+    def end(self) -> float:
+        return self.init + self.duration
+
+    def update(self, synth: CountingSynth, current_beat: float) -> bool:
+        if current_beat >= self.end:
+            synth.noteoff(self.channel, self.note)
+            return True
+        return False
+
+
+def held_sounds(held: int) -> list[Sound]:
+    # Long notes that never end during the benchmark
+    return [Sound(0, 60, 100, 0.0, 1e9) for _ in range(held)]
+
+
+def short_sound(beat: float) -> Sound:
+    return Sound(1, 40, 100, beat, 0.25)
+
+
+def run_list(held: int) -> float:
+    synth = CountingSynth()
+    sounds: list[tuple[int, Sound]] = [(0, sound) for sound in held_sounds(held)]
+
+    beat = 0.0
+    start = perf_counter()
+    for iteration in range(ITERATIONS):
+        beat += BEATS_PER_ITERATION
+        if iteration % 10 == 0:
+            sounds.append((1, short_sound(beat)))
+
+        sounds_to_remove = []
+        for sound in sounds:
+            if sound[1].update(synth, beat):
+                sounds_to_remove.append(sound)
+
+        for sound in sounds_to_remove:
+            sounds.remove(sound)
+
+    return (perf_counter() - start) / ITERATIONS
+
+
+def run_pool(held: int) -> float:
+    synth = CountingSynth()
+    sounds = ActiveNotePool()
+    for sound in held_sounds(held):
+        sounds.push(0, sound.channel, sound.note, sound.velocity, sound.init, sound.end)
+
+    beat = 0.0
+    start = perf_counter()
+    for iteration in range(ITERATIONS):
+        beat += BEATS_PER_ITERATION
+        if iteration % 10 == 0:
+            sounds.push(1, 1, 40, 100, beat, beat + 0.25)
+
+        index = sounds.pop_due(beat)
+        while index >= 0:
+            synth.noteoff(sounds.channels[index], sounds.notes[index])
+            index = sounds.pop_due(beat)
+
+    return (perf_counter() - start) / ITERATIONS
+
+
+def main():
+    print(f"{'held notes':>10} {'list (us/iter)':>15} {'pool (us/iter)':>15}")
+    for held in HELD_NOTES:
+        list_time = run_list(held) * 1e6
+        pool_time = run_pool(held) * 1e6
+        print(f"{held:>10} {list_time:>15.2f} {pool_time:>15.2f}")
+
+
+if __name__ == "__main__":
+    main()
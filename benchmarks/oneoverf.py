@@ -0,0 +1,73 @@
+"""Benchmarks the generation of one over f values.
+
+Compares calling ``one_over_f`` once per value with generating blocks
+of values with ``OneOverFGenerator``, for each chaotic map, and checks
+that both give the same values.
+
+Run with ``python -m benchmarks.oneoverf``.
+"""
+
+from time import perf_counter
+
+from src.generative.fractal import (
+    ChaosSource,
+    LogisticMap,
+    OneOverFGenerator,
+    TentMap,
+    one_over_f,
+)
+
+VALUES = 200000
+N = 0.75
+BLOCK_SIZES = [32, 256]
+
+
+def run_scalar(source: ChaosSource) -> tuple[float, list[float]]:
+    x = 0.0
+    r = 0.4
+    values = []
+
+    start = perf_counter()
+    for _ in range(VALUES):
+        x, r = one_over_f(x, N, r, source)
+        values.append(x)
+
+    return ((perf_counter() - start) / VALUES, values)
+
+
+def run_block(source: ChaosSource, block_size: int) -> tuple[float, list[float]]:
+    generator = OneOverFGenerator(source, block_size)
+    x = 0.0
+    r = 0.4
+    values = []
+
+    start = perf_counter()
+    for _ in range(VALUES // block_size):
+        block, states = generator.generate(block_size, x, N, r)
+        x = block[-1].item()
+        r = states[-1].item()
+        values.extend(block.tolist())
+
+    return ((perf_counter() - start) / VALUES, values)
+
+
+def main():
+    print(f"{'source':>12} {'block size':>10} {'ns/value':>10} {'speedup':>8}")
+    for source in [LogisticMap(4), TentMap()]:
+        name = type(source).__name__
+        scalar_time, expected = run_scalar(source)
+        print(f"{name:>12} {'scalar':>10} {scalar_time * 1e9:>10.1f} {1:>8.1f}")
+
+        for block_size in BLOCK_SIZES:
+            block_time, values = run_block(source, block_size)
+            if values != expected[: len(values)]:
+                raise AssertionError(f"{name} block of {block_size} differs")
+
+            print(
+                f"{name:>12} {block_size:>10} {block_time * 1e9:>10.1f} "
+                f"{scalar_time / block_time:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Benchmarks how long the sound engine loop is blocked by generating sounds.
+
+Runs the engine with many monsters, generating their sounds in the loop
+and on a GenerationPool, and reports how long the iterations of the loop
+take. Long iterations are notes played late.
+
+Run with ``python -m benchmarks.pool``.
+"""
+
+import statistics
+from time import perf_counter
+
+from src.clock import Clock
+from src.soundengine.backend import NullBackend
+from src.soundengine.generation import GenerationPool
+from src.soundengine.scene import MONSTER_TYPES
+from src.soundengine.soundengine import SoundEngine
+
+MONSTER_COUNTS = [100, 1000]
+WORKERS = [0, 1, 2, 4]
+SECONDS = 3.0
+BPM = 480
+LOOKAHEAD_BEATS = 8.0
+
+
+def run(monster_count: int, workers: int) -> list[float]:
+    pool = GenerationPool(workers) if workers > 0 else None
+    engine = SoundEngine(NullBackend(), Clock(BPM, 4, 4), None, LOOKAHEAD_BEATS, pool)
+
+    monster_types = list(MONSTER_TYPES.values())
+    for monster_id in range(monster_count):
+        monster_type = monster_types[monster_id % len(monster_types)]
+        position = ((monster_id % 97) / 97, (monster_id % 89) / 89)
+        engine.monsters[monster_id] = monster_type(position)
+        engine.monsters[monster_id].initialize(0.0)
+
+    iterations = []
+    start = perf_counter()
+    while perf_counter() - start < SECONDS:
+        iteration_start = perf_counter()
+        current_beat = engine.generate()
+        engine.release(current_beat)
+        engine.trigger(current_beat)
+        engine.refill()
+        iterations.append(perf_counter() - iteration_start)
+
+    engine.shutdown()
+    return iterations
+
+
+def main():
+    print(
+        f"{'monsters':>9} {'workers':>8} {'median (ms)':>12} "
+        f"{'p99 (ms)':>10} {'max (ms)':>10}"
+    )
+    for monster_count in MONSTER_COUNTS:
+        for workers in WORKERS:
+            iterations = sorted(run(monster_count, workers))
+            median = statistics.median(iterations) * 1e3
+            p99 = iterations[int(len(iterations) * 0.99)] * 1e3
+            print(
+                f"{monster_count:>9} {workers:>8} {median:>12.3f} "
+                f"{p99:>10.3f} {iterations[-1] * 1e3:>10.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Benchmarks rendering a frame of the game with many monsters on the field.
+
+Places monsters on the field, and times updating and rendering a frame
+when the whole screen is redrawn every frame, and when only the areas
+that changed are. The scene is static, or a few monsters start or stop
+playing every frame. No window is needed, the dummy video driver is used.
+
+Run with ``python -m benchmarks.render``.
+"""
+
+import os
+
+# The video driver has to be chosen before pygame is imported
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+# pylint: disable=wrong-import-position
+from contextlib import redirect_stdout
+from multiprocessing import Queue
+
+import pygame
+
+from benchmarks.suite import measure
+from src.__main__ import Game
+from src.commands.batch import CommandBatcher
+from src.config import Configs
+from src.field import MonsterField
+from src.monsters.draggable import DraggableMonster
+from src.soundengine.activity import ActivityTable
+from src.ui import UI
+from src.ui.renderer import DirtyRectRenderer
+
+# pylint: enable=wrong-import-position
+
+MONSTER_COUNT = 200
+CHANGING_MONSTERS = 10
+
+
+def setup(activity: ActivityTable) -> tuple[Game, pygame.Surface]:
+    configs = Configs()
+
+    pygame.init()
+    screen = pygame.display.set_mode((configs.screen_width, configs.screen_height))
+
+    game = Game()
+    game.load_monster_info()
+
+    batcher = CommandBatcher(Queue())
+    game.monster_field = MonsterField(batcher, activity)
+    game.ui = UI(game.monster_field, batcher, batcher, game.monster_info)
+    game.renderer = DirtyRectRenderer(screen.get_size())
+
+    monster_info = list(game.monster_info.items())
+    # Every monster created is printed
+    with open(os.devnull, "w", encoding="utf-8") as devnull, redirect_stdout(devnull):
+        for index in range(MONSTER_COUNT):
+            monster_type, info = monster_info[index % len(monster_info)]
+            position = (
+                (index * 53) % (game.monster_field.width - 64),
+                (index * 31) % (game.monster_field.height - 64),
+            )
+            game.monster_field.add_monster(
+                DraggableMonster(
+                    monster_type, info.image, info.inactive_image, position
+                )
+            )
+
+    game.delta_time = game.milliseconds_per_frame
+    return game, screen
+
+
+def main():
+    activity = ActivityTable(MONSTER_COUNT)
+    game, screen = setup(activity)
+    monster_ids = list(game.monster_field.draggable_monsters)
+    frames = [0]
+
+    def frame(full_redraw: bool, changing: int):
+        # The activity of a few monsters is flipped, as if they played notes
+        frames[0] += 1
+        for index in range(changing):
+            monster_id = monster_ids[(frames[0] * changing + index) % MONSTER_COUNT]
+            activity.counts[monster_id] = 1 - activity.counts[monster_id]
+
+        if full_redraw:
+            game.renderer.invalidate()
+        game.update()
+        game.render(screen)
+
+    print(f"{MONSTER_COUNT} monsters on the field")
+    print(f"{'scene':>18} {'full (us)':>10} {'dirty (us)':>11} {'speedup':>8}")
+    for scene, changing in [
+        ("static", 0),
+        (f"{CHANGING_MONSTERS} changing", CHANGING_MONSTERS),
+    ]:
+        full = measure(lambda changing=changing: frame(True, changing))["median"]
+        dirty = measure(lambda changing=changing: frame(False, changing))["median"]
+        print(f"{scene:>18} {full * 1e6:10.1f} {dirty * 1e6:11.1f} {full / dirty:8.1f}")
+
+    activity.close()
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
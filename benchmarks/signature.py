@@ -0,0 +1,70 @@
+"""Benchmarks the latency of changing the time signature of the clock.
+
+Compares computing the pulse weights of the new time signature when it
+changes, as the clock used to, with looking them up in the precomputed
+table, for every time signature that can be used.
+
+Run with ``python -m benchmarks.signature``.
+"""
+
+import statistics
+from time import perf_counter
+
+from src.clock import Clock
+from src.generative.indispensability import (
+    SIGNATURE_DENOMINATORS,
+    SIGNATURE_NOMINATORS,
+    precompute_pulse_weights,
+    pulse_weights,
+)
+
+REPETITIONS = 20
+
+
+def signatures() -> list[tuple[int, int]]:
+    return [
+        (nominator, denominator)
+        for nominator in SIGNATURE_NOMINATORS
+        for denominator in SIGNATURE_DENOMINATORS
+    ]
+
+
+def run_computed() -> list[float]:
+    latencies = []
+    for _ in range(REPETITIONS):
+        for nominator, denominator in signatures():
+            # Computing the weights when the time signature changes
+            start = perf_counter()
+            pulse_weights(nominator, denominator)
+            latencies.append(perf_counter() - start)
+
+    return latencies
+
+
+def run_table(clock: Clock) -> list[float]:
+    precompute_pulse_weights()
+
+    latencies = []
+    for _ in range(REPETITIONS):
+        for nominator, denominator in signatures():
+            start = perf_counter()
+            clock.change_signature(nominator, denominator)
+            latencies.append(perf_counter() - start)
+
+    return latencies
+
+
+def main():
+    clock = Clock(80, 4, 4)
+
+    print(f"{'weights':>10} {'median (us)':>12} {'max (us)':>10}")
+    for name, latencies in [
+        ("computed", run_computed()),
+        ("table", run_table(clock)),
+    ]:
+        median = statistics.median(latencies) * 1e6
+        print(f"{name:>10} {median:>12.2f} {max(latencies) * 1e6:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""The benchmarks run by ``python -m benchmarks``.
+
+Every benchmark is a function that does a small piece of work,
+and is timed by calling it many times. Benchmarks are named after
+what they time, e.g. ``generative.morse_thue_value`` or
+``engine.iteration[100]``, so their results can be compared by name.
+"""
+
+import statistics
+import timeit
+from typing import Callable
+
+import numpy as np
+
+from src.clock import Clock
+from src.generative.euclidean import euclidean_rhythm
+from src.generative.fractal import morse_thue_value, one_over_f
+from src.generative.indispensability import pulse_weights
+from src.monsters import BLOCK_SIZE
+from src.plugins import ConstantDurationPlugin, ConstantRestPlugin, MonsterPlugin
+from src.plugins.euclidean import EuclideanRhythmPlugin
+from src.plugins.fractal import FractalDurationPlugin, FractalNotePlugin, OneOverFPlugin
+from src.plugins.octaver import MultiplicativeOctavePlugin, OctavePlugin
+from src.soundengine.backend import NullBackend
+from src.soundengine.scene import MONSTER_TYPES
+from src.soundengine.soundengine import SoundEngine
+
+REPEAT = 7
+ENGINE_MONSTER_COUNTS = [10, 100, 1000]
+ENGINE_STEP = 0.01
+
+
+class ManualTime:
+    """A time source for the clock that only moves when it is told to,
+    so that every engine iteration covers the same amount of music."""
+
+    def __init__(self):
+        self.time = 0.0
+
+    def __call__(self) -> float:
+        return self.time
+
+
+def measure(function: Callable[[], object], repeat: int = REPEAT) -> dict:
+    """Times a function.
+
+    The function is called enough times in a row to take about 0.2 seconds,
+    and that is repeated ``repeat`` times.
+
+    Returns
+    -------
+    dict
+        The median and minimum time of a call, in seconds,
+        and the number of calls in each repetition.
+    """
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    times = [time / number for time in timer.repeat(repeat, number)]
+
+    return {"median": statistics.median(times), "min": min(times), "number": number}
+
+
+def generative_benchmarks() -> dict[str, Callable[[], object]]:
+    state = [0.0, 0.4]
+
+    def next_one_over_f():
+        state[0], state[1] = one_over_f(state[0], 0.75, state[1])
+
+    return {
+        "generative.euclidean_rhythm[13,5]": lambda: euclidean_rhythm(13, 5, 2),
+        "generative.euclidean_rhythm[64,27]": lambda: euclidean_rhythm(64, 27, 9),
+        "generative.morse_thue_value": lambda: morse_thue_value(123456, 3, 33),
+        "generative.pulse_weights[4/4]": lambda: pulse_weights(4, 4),
+        "generative.pulse_weights[7/8]": lambda: pulse_weights(7, 8),
+        "generative.one_over_f": next_one_over_f,
+    }
+
+
+def plugin_benchmarks() -> dict[str, Callable[[], object]]:
+    plugins: list[MonsterPlugin] = [
+        ConstantRestPlugin(1),
+        ConstantDurationPlugin(0.25),
+        OctavePlugin(0, 2),
+        MultiplicativeOctavePlugin(0, 2),
+        EuclideanRhythmPlugin(13, 5, 2, 0, 0),
+        FractalNotePlugin(3, 33),
+        FractalDurationPlugin(3, 33),
+        OneOverFPlugin(0.75),
+    ]
+
+    notes = np.arange(BLOCK_SIZE)
+    durations = np.full(BLOCK_SIZE, 0.5)
+    rests = np.full(BLOCK_SIZE, 0.25)
+
+    benchmarks = {}
+    for plugin in plugins:
+        name = type(plugin).__name__
+        benchmarks[f"plugins.{name}.transform"] = (
+            lambda plugin=plugin: plugin.transform(5, 0.5, 0.25)
+        )
+        benchmarks[f"plugins.{name}.transform_batch[{BLOCK_SIZE}]"] = (
+            lambda plugin=plugin: plugin.transform_batch(notes, durations, rests)
+        )
+
+    return benchmarks
+
+
+def monster_benchmarks() -> dict[str, Callable[[], object]]:
+    """Times generating the next sound for each monster class."""
+    clock = Clock(80, 4, 4, time=ManualTime())
+
+    benchmarks = {}
+    for name, monster_type in MONSTER_TYPES.items():
+        monster = monster_type((0.5, 0.5))
+        monster.initialize(0.0)
+
+        def generate_block(monster=monster):
+            # Without sounds in the buffer, the next one is generated,
+            # in a block of one sound, as the monster is past the window
+            monster.lookahead.clear()
+            monster.generate_next_sound(clock)
+
+        benchmarks[f"monsters.{name}.generate_next_sound"] = generate_block
+
+    return benchmarks
+
+
+def engine_benchmarks() -> dict[str, Callable[[], object]]:
+    """Times an iteration of the engine loop, with the clock moving
+    ``ENGINE_STEP`` seconds between iterations."""
+    monster_types = list(MONSTER_TYPES.values())
+
+    benchmarks = {}
+    for monster_count in ENGINE_MONSTER_COUNTS:
+        time = ManualTime()
+        engine = SoundEngine(
+            NullBackend(), Clock(80, 4, 4, time=time), lookahead_beats=2.0
+        )
+        for monster_id in range(monster_count):
+            monster_type = monster_types[monster_id % len(monster_types)]
+            position = ((monster_id % 97) / 97, (monster_id % 89) / 89)
+            engine.monsters[monster_id] = monster_type(position)
+            engine.monsters[monster_id].initialize(0.0)
+
+        def iteration(engine=engine, time=time):
+            time.time += ENGINE_STEP
+            current_beat = engine.generate()
+            engine.release(current_beat)
+            engine.trigger(current_beat)
+            engine.refill()
+
+        benchmarks[f"engine.iteration[{monster_count}]"] = iteration
+
+    return benchmarks
+
+
+def benchmarks() -> dict[str, Callable[[], object]]:
+    """Returns every benchmark of the suite, by name."""
+    return {
+        **generative_benchmarks(),
+        **plugin_benchmarks(),
+        **monster_benchmarks(),
+        **engine_benchmarks(),
+    }
@@ -1,11 +1,13 @@
 import sys
 from enum import Enum
-from multiprocessing import Event, Process, Queue
+from multiprocessing import Event, Pipe, Process, Queue, SimpleQueue
 from typing import Type
 
 import pygame
 import pygame_gui
 
+from src.commands import LatencyStatsCommand
+from src.commands.batch import CommandBatcher
 from src.config import Configs
 from src.field import MonsterField
 from src.generative.indispensability import (
@@ -26,7 +28,14 @@ from src.monsters.fractalmonster import (
 )
 from src.monsters.monsterinfo import MonsterInfo
 from src.soundengine import soundengine
+from src.soundengine.activity import ActivityTable
+from src.soundengine.latency import LatencyReport
 from src.ui import UI
+from src.ui.profiler import FrameProfiler
+from src.ui.renderer import BACKGROUND, DirtyRectRenderer
+
+# How long, in seconds, the sound engine has to stop when the game closes
+ENGINE_STOP_TIMEOUT = 5
 
 
 class GameState(Enum):
@@ -47,42 +56,87 @@ class Game:
         self.state = GameState.RUNNING
 
         self.monster_info: dict[Type[Monster], MonsterInfo] = {}
+        # The last latency stats sent back by the sound engine
+        self.latency_report: LatencyReport | None = None
+        self.profiler = FrameProfiler(
+            self.milliseconds_per_frame, Configs().frame_profile_path
+        )
 
     def process_events(self):
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.state = GameState.STOPPED
 
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F2:
+                self.profiler.toggle()
+
+            if event.type == pygame.WINDOWEXPOSED:
+                self.renderer.invalidate()
+
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                self.clock_command_batcher.put(
+                    LatencyStatsCommand(Configs().lateness_threshold)
+                )
+
             self.monster_field.process_events(event)
             self.ui.process_events(event)
 
-    def render(self, screen: pygame.Surface):
-        screen.fill("#5BC4A4")
-        self.monster_field.render(screen)
-        self.ui.render(screen)
+    def receive_engine_replies(self):
+        """Shows the results the sound engine sent back for commands."""
+        while not self.engine_reply_queue.empty():
+            report = self.engine_reply_queue.get()
+            if report is None:
+                print("Latency stats are disabled, set LATENCY_STATS=1 to record them")
+                continue
 
-        pygame.display.flip()
+            self.latency_report = report
+            print(report.text())
+
+    def render(self, screen: pygame.Surface):
+        overlay_rects = self.profiler.dirty_rects()
+        self.profiler.end_stage("overlay")
+
+        rects = self.renderer.dirty_rects(self.monster_field, self.ui, overlay_rects)
+        if rects is None:
+            screen.fill(BACKGROUND)
+        else:
+            for rect in rects:
+                screen.fill(BACKGROUND, rect)
+        self.monster_field.render(screen, rects)
+        self.profiler.end_stage("field")
+
+        self.ui.render(screen, rects)
+        self.profiler.end_stage("ui")
+
+        self.profiler.render(screen, rects)
+        self.profiler.end_stage("overlay")
+
+        if rects is None:
+            pygame.display.flip()
+        elif rects:
+            pygame.display.update(rects)
+        self.profiler.end_stage("flip")
 
     def update(self):
         self.ui.update(self.delta_time)
         self.monster_field.update(self.delta_time)
 
     def handle_run(self, screen: pygame.Surface):
+        self.profiler.start_frame(self.lag)
         self.process_events()
+        self.profiler.end_stage("events")
 
+        update_steps = 0
         while self.lag >= self.milliseconds_per_frame:
             self.update()
             self.lag -= self.milliseconds_per_frame
+            update_steps += 1
+        self.profiler.end_stage("update", update_steps)
 
         self.render(screen)
+        self.profiler.end_frame()
 
-    def start(self):
-        configs = Configs()
-
-        pygame.init()
-        screen = pygame.display.set_mode((configs.screen_width, configs.screen_height))
-        pygame.display.set_caption("Songtide")
-
+    def load_monster_info(self):
         ethereal_echo_image = pygame.image.load(
             "resources/sprites/EtherealEcho.png"
         ).convert_alpha()
@@ -181,6 +235,15 @@ class Game:
             rattle_snare_image,
         )
 
+    def start(self):
+        configs = Configs()
+
+        pygame.init()
+        screen = pygame.display.set_mode((configs.screen_width, configs.screen_height))
+        pygame.display.set_caption("Songtide")
+
+        self.load_monster_info()
+
         self.manager = pygame_gui.UIManager(
             (configs.screen_width, configs.screen_height)
         )
@@ -188,9 +251,13 @@ class Game:
         # print(pulse_weights(3, 4))
 
         stop_event = Event()
-        monster_command_queue = Queue()
-        clock_command_queue = Queue()
-        monster_sound_queue = Queue()
+        # Commands are written before put returns, and the engine is woken
+        # up for them once they are there
+        monster_command_queue = SimpleQueue()
+        clock_command_queue = SimpleQueue()
+        wakeups_reader, wakeups_writer = Pipe(duplex=False)
+        self.engine_reply_queue = Queue()
+        activity = ActivityTable(configs.max_monsters)
 
         soundengine_process = Process(
             target=soundengine.start,
@@ -198,16 +265,24 @@ class Game:
                 stop_event,
                 monster_command_queue,
                 clock_command_queue,
-                monster_sound_queue,
+                activity.name,
+                self.engine_reply_queue,
+                wakeups_reader,
             ),
         )
         soundengine_process.start()
 
-        self.monster_field = MonsterField(monster_command_queue, monster_sound_queue)
+        # Commands are sent to the sound engine once per frame
+        monster_command_batcher = CommandBatcher(monster_command_queue, wakeups_writer)
+        clock_command_batcher = CommandBatcher(clock_command_queue, wakeups_writer)
+        self.clock_command_batcher = clock_command_batcher
+
+        self.monster_field = MonsterField(monster_command_batcher, activity)
+        self.renderer = DirtyRectRenderer(screen.get_size())
         self.ui = UI(
             self.monster_field,
-            clock_command_queue,
-            monster_command_queue,
+            clock_command_batcher,
+            monster_command_batcher,
             self.monster_info,
         )
 
@@ -221,11 +296,27 @@ class Game:
                 case _:
                     pass
 
+            monster_command_batcher.flush()
+            clock_command_batcher.flush()
+            self.receive_engine_replies()
+
             self.delta_time = self.clock.tick(60)
             self.lag += self.delta_time
 
         stop_event.set()
-        # soundengine_process.join()
+        self.profiler.close()
+
+        print(f"Monster commands: {monster_command_batcher.counter.summary()}")
+        print(f"Clock commands: {clock_command_batcher.counter.summary()}")
+
+        # The sound engine writes to the activity table until it stops,
+        # so the table is only freed once the engine is gone
+        soundengine_process.join(ENGINE_STOP_TIMEOUT)
+        if soundengine_process.is_alive():
+            print("The sound engine did not stop in time, terminating it")
+            soundengine_process.terminate()
+            soundengine_process.join()
+        activity.close()
 
         pygame.quit()
         sys.exit()
@@ -1,14 +1,27 @@
 from time import perf_counter
+from typing import Callable
 
-from src.generative.indispensability import pulse_weights
+from src.generative.indispensability import METRIC_LEVELS, pulse_weight_table
 
 
 class Clock:
-    def __init__(self, bpm: float, nominator: int, denominator: int):
+    def __init__(
+        self,
+        bpm: float,
+        nominator: int,
+        denominator: int,
+        time: Callable[[], float] = perf_counter,
+        metric_level: int = 16,
+    ):
+        if metric_level not in METRIC_LEVELS:
+            raise ValueError(f"Unsupported metric level {metric_level}")
+
+        self.metric_level = metric_level
         self.change_bpm(bpm)
         self.change_signature(nominator, denominator)
 
-        self.previous_time = perf_counter()
+        self.time = time
+        self.previous_time = self.time()
 
         self.current_beat = 0.0
         self.current_bar = 0.0
@@ -18,6 +31,12 @@ class Clock:
         self.current_beat += delta_beat
         self.current_bar += delta_beat / self.beats_per_bar
 
+    def catch_up(self, beat: float) -> float:
+        """Moves the clock forward to a beat, if it is behind it."""
+        if self.current_beat < beat:
+            self.update(self.beats_to_seconds(beat - self.current_beat))
+        return self.current_beat
+
     def change_bpm(self, bpm: float):
         self.bpm = bpm
         self.seconds_per_beat = 60 / self.bpm
@@ -27,17 +46,33 @@ class Clock:
         self.denominator = denominator
         self.beats_per_bar = 4 / self.denominator * self.nominator
 
-        self.pulse_weights = pulse_weights(nominator, denominator)
+        self.pulse_weights = pulse_weight_table(
+            nominator, denominator, self.metric_level
+        )
 
     def beat_to_bar(self, beat: float) -> float:
         return beat / self.beats_per_bar
 
+    def beats_to_seconds(self, beats: float) -> float:
+        return beats * self.seconds_per_beat
+
     def remaining_beats_to_bar(self, beat: float) -> float:
         beat = beat % self.beats_per_bar
         return self.beats_per_bar - beat
 
+    def now(self) -> float:
+        """Returns the current beat, without moving the clock."""
+        delta_time = self.time() - self.previous_time
+        return self.current_beat + delta_time / self.seconds_per_beat
+
+    def restart(self):
+        """Moves the clock back to the first beat, and counts from now."""
+        self.previous_time = self.time()
+        self.current_beat = 0.0
+        self.current_bar = 0.0
+
     def tick(self) -> float:
-        time = perf_counter()
+        time = self.time()
         delta_time = time - self.previous_time
         self.previous_time = time
 
@@ -1,16 +1,27 @@
 from abc import ABC, abstractmethod
-from typing import Callable, Type
+from typing import TYPE_CHECKING, Callable, Type
 
 from src.clock import Clock
 from src.monsters import Monster
 
+if TYPE_CHECKING:
+    from src.soundengine.soundengine import SoundEngine
+
 
 class MonsterCommand(ABC):
     """A command that can be executed on a monster dictionary.
 
     Used to synchronize monsters between the GUI and the sound engine.
+
+    Attributes
+    ----------
+    affects_generation : bool
+        Whether the command changes how the sounds of the monster are
+        generated, so it has to wait for a generation in flight to finish.
     """
 
+    affects_generation: bool = True
+
     @abstractmethod
     def __init__(self, id: int):
         self.id = id
@@ -19,6 +30,15 @@ class MonsterCommand(ABC):
     def execute(self, monster_dict: dict[int, Monster]) -> Monster:
         pass
 
+    def coalesce_key(self) -> tuple | None:
+        """Returns a key shared by commands that overwrite each other.
+
+        When several commands with the same key are sent together,
+        only the newest one needs to be executed.
+        Commands that return None are never dropped.
+        """
+        return None
+
 
 class CreateMonsterCommand(MonsterCommand):
     """A command that creates a monster.
@@ -68,6 +88,9 @@ class UpdateMonsterPositionCommand(MonsterCommand):
         The new position of the monster.
     """
 
+    # The position only applies when the sounds are played
+    affects_generation = False
+
     def __init__(self, id: int, position: tuple[int, int]):
         super().__init__(id)
         self.position = position
@@ -75,6 +98,9 @@ class UpdateMonsterPositionCommand(MonsterCommand):
     def execute(self, monster_dict: dict[int, Monster]):
         monster_dict[self.id].change_position(self.position)
 
+    def coalesce_key(self) -> tuple:
+        return ("position", self.id)
+
 
 class UpdateMonsterMutedCommand(MonsterCommand):
     """A command that updates the muted state of a monster.
@@ -87,6 +113,8 @@ class UpdateMonsterMutedCommand(MonsterCommand):
         Whether the monster is muted or not.
     """
 
+    affects_generation = False
+
     def __init__(self, id: int, muted: bool):
         super().__init__(id)
         self.muted = muted
@@ -94,6 +122,9 @@ class UpdateMonsterMutedCommand(MonsterCommand):
     def execute(self, monster_dict: dict[int, Monster]):
         monster_dict[self.id].muted = self.muted
 
+    def coalesce_key(self) -> tuple:
+        return ("muted", self.id)
+
 
 class UpdateMonsterPluginParameterCommand(MonsterCommand):
     """A command that updates a plugin parameter of a monster.
@@ -114,7 +145,10 @@ class UpdateMonsterPluginParameterCommand(MonsterCommand):
         self.value = value
 
     def execute(self, monster_dict: dict[int, Monster]):
-        monster_dict[self.id].plugin_parameters[self.parameter_index].save(self.value)
+        monster_dict[self.id].set_plugin_parameter(self.parameter_index, self.value)
+
+    def coalesce_key(self) -> tuple:
+        return ("parameter", self.id, self.parameter_index)
 
 
 class ClockCommand(ABC):
@@ -127,6 +161,15 @@ class ClockCommand(ABC):
     def execute(self, clock: Clock):
         pass
 
+    def coalesce_key(self) -> tuple | None:
+        """Returns a key shared by commands that overwrite each other.
+
+        When several commands with the same key are sent together,
+        only the newest one needs to be executed.
+        Commands that return None are never dropped.
+        """
+        return None
+
 
 class UpdateClockBpmCommand(ClockCommand):
     """A command that updates the BPM of a clock.
@@ -143,6 +186,9 @@ class UpdateClockBpmCommand(ClockCommand):
     def execute(self, clock: Clock):
         clock.change_bpm(self.bpm)
 
+    def coalesce_key(self) -> tuple:
+        return ("bpm",)
+
 
 class UpdateClockSignatureCommand(ClockCommand):
     """A command that updates the time signature of a clock.
@@ -161,3 +207,39 @@ class UpdateClockSignatureCommand(ClockCommand):
 
     def execute(self, clock: Clock):
         clock.change_signature(self.nominator, self.denominator)
+
+    def coalesce_key(self) -> tuple:
+        return ("signature",)
+
+
+class EngineCommand(ABC):
+    """A command that is executed on the sound engine itself.
+
+    Sent to the sound engine along with the clock commands.
+    """
+
+    @abstractmethod
+    def execute(self, engine: "SoundEngine"):
+        pass
+
+    def coalesce_key(self) -> tuple | None:
+        return None
+
+
+class LatencyStatsCommand(EngineCommand):
+    """A command that sends back how late the sound engine played the notes
+    of each channel, as a ``LatencyReport`` on the reply queue of the
+    engine, or None if the engine does not record it.
+
+    Attributes
+    ----------
+    threshold : float
+        How late, in milliseconds, a note has to be to count as late.
+    """
+
+    def __init__(self, threshold: float):
+        self.threshold = threshold
+
+    def execute(self, engine: "SoundEngine"):
+        stats = engine.latency_stats()
+        engine.reply(None if stats is None else stats.report(self.threshold))
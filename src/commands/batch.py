@@ -0,0 +1,117 @@
+from multiprocessing import Queue
+from multiprocessing.connection import Connection
+from time import perf_counter
+
+from src.commands import ClockCommand, MonsterCommand
+
+
+def coalesce(
+    commands: list[MonsterCommand | ClockCommand],
+) -> list[MonsterCommand | ClockCommand]:
+    """Drops the commands that are overwritten by a newer command in the list.
+
+    Only the newest command for each coalesce key is kept, in the place of
+    that newest command. Commands without a key, like creating or deleting
+    a monster, are kept as they are, and nothing is merged across them,
+    so the commands that are kept stay in order relative to them.
+
+    Parameters
+    ----------
+    commands : list[MonsterCommand | ClockCommand]
+        The commands, in the order they were produced.
+
+    Returns
+    -------
+    list[MonsterCommand | ClockCommand]
+        The commands that have to be executed, in order.
+    """
+    kept: list[MonsterCommand | ClockCommand | None] = []
+    newest: dict[tuple, int] = {}
+
+    for command in commands:
+        key = command.coalesce_key()
+        if key is None:
+            newest.clear()
+        else:
+            if key in newest:
+                kept[newest[key]] = None
+            newest[key] = len(kept)
+
+        kept.append(command)
+
+    return [command for command in kept if command is not None]
+
+
+class MessageCounter:
+    """Counts the messages sent between the GUI and the sound engine,
+    and the commands they carry.
+
+    Without batching every command is its own message,
+    so the command rate is the message rate it replaces.
+    """
+
+    def __init__(self):
+        self.messages = 0
+        self.commands = 0
+        self.coalesced = 0
+        self.start_time = perf_counter()
+
+    def count(self, commands: int, coalesced: int = 0):
+        self.messages += 1
+        self.commands += commands
+        self.coalesced += coalesced
+
+    def rates(self) -> tuple[float, float]:
+        """Returns the messages per second and commands per second so far."""
+        elapsed = max(perf_counter() - self.start_time, 1e-9)
+        return (self.messages / elapsed, self.commands / elapsed)
+
+    def summary(self) -> str:
+        messages_per_second, commands_per_second = self.rates()
+        return (
+            f"{messages_per_second:.2f} messages/s carrying "
+            f"{commands_per_second:.2f} commands/s, "
+            f"{self.coalesced} commands coalesced"
+        )
+
+
+class CommandBatcher:
+    """Collects the commands produced during a frame,
+    and sends them to the sound engine as a single message.
+
+    It can be used in place of the queue it wraps, and the commands put
+    during a frame are sent as a list when the frame is flushed.
+    Commands overwritten by a newer one in the same frame are not sent.
+    The engine executes each list in order before making sounds.
+
+    Parameters
+    ----------
+    queue : Queue
+        The queue the commands are sent on.
+    wakeups : Connection | None, optional
+        A signal is sent on it after every message, so the sound engine
+        can wake up for the commands while it waits for events. The queue
+        has to write the message before ``put`` returns, like a
+        ``SimpleQueue``, so the commands arrive before the signal.
+    """
+
+    def __init__(self, queue: Queue, wakeups: Connection | None = None):
+        self.queue = queue
+        self.wakeups = wakeups
+        self.commands = []
+        self.counter = MessageCounter()
+
+    def put(self, command):
+        self.commands.append(command)
+
+    def flush(self):
+        """Sends the commands collected since the last flush, if any."""
+        if not self.commands:
+            return
+
+        commands = coalesce(self.commands)
+        self.queue.put(commands)
+        if self.wakeups is not None:
+            self.wakeups.send_bytes(b"")
+        self.counter.count(len(self.commands), len(self.commands) - len(commands))
+        self.commands = []
@@ -24,6 +24,17 @@ class Configs(metaclass=SingletonMeta):
     midi_driver: str = None
     audio_driver: str = None
     sample_rate: float = 48000.0
+    engine_mode: str = None
+    timing_slack: float = None
+    lookahead_beats: float = None
+    synth_backend: str = None
+    midi_export_path: str = None
+    max_monsters: int = None
+    metric_level: int = None
+    generation_workers: int = None
+    latency_stats: bool = None
+    lateness_threshold: float = None
+    frame_profile_path: str = None
 
     def __init__(self) -> None:
         load_dotenv()
@@ -34,3 +45,14 @@ class Configs(metaclass=SingletonMeta):
         self.midi_driver = os.getenv("MIDI_DRIVER", "alsa_seq")
         self.audio_driver = os.getenv("AUDIO_DRIVER", "pulseaudio")
         self.sample_rate = float(os.getenv("SAMPLE_RATE", 48000.0))
+        self.engine_mode = os.getenv("ENGINE_MODE", "event")
+        self.timing_slack = float(os.getenv("TIMING_SLACK", 2.0))
+        self.lookahead_beats = float(os.getenv("LOOKAHEAD_BEATS", 2.0))
+        self.synth_backend = os.getenv("SYNTH_BACKEND", "fluidsynth")
+        self.midi_export_path = os.getenv("MIDI_EXPORT_PATH", "")
+        self.max_monsters = int(os.getenv("MAX_MONSTERS", 16384))
+        self.metric_level = int(os.getenv("METRIC_LEVEL", 16))
+        self.generation_workers = int(os.getenv("GENERATION_WORKERS", 2))
+        self.latency_stats = os.getenv("LATENCY_STATS", "0") == "1"
+        self.lateness_threshold = float(os.getenv("LATENESS_THRESHOLD", 5.0))
+        self.frame_profile_path = os.getenv("FRAME_PROFILE_PATH", "")
@@ -1,36 +1,34 @@
-from multiprocessing import Queue
-
 import pygame
 
-from src.commands import (
-    CreateMonsterCommand,
-    MonsterCommand,
-    UpdateMonsterPositionCommand,
-)
+from src.commands import CreateMonsterCommand, UpdateMonsterPositionCommand
+from src.commands.batch import CommandBatcher
 from src.config import Configs
 from src.monsters.draggable import DraggableMonster
 from src.monsters.monsterrepository import MonsterRepository
-from src.soundengine.sound import MonsterSoundEvent
+from src.soundengine.activity import ActivityTable
 
 
 class MonsterField:
     def __init__(
         self,
-        monster_command_queue: "Queue[MonsterCommand]",
-        monster_sound_queue: "Queue[MonsterSoundEvent]",
+        monster_command_queue: CommandBatcher,
+        activity: ActivityTable,
     ):
         configs = Configs()
 
         self.monsters = MonsterRepository()
         self.draggable_monsters: dict[int, DraggableMonster] = {}
         self.monster_command_queue = monster_command_queue
-        self.monster_sound_queue = monster_sound_queue
+        self.activity = activity
 
         self.width = configs.screen_width
         self.height = configs.screen_height - 100
 
         self.ui_observer = None
 
+        # Where removed monsters were drawn, to be cleared
+        self.removed_rects: list[pygame.Rect] = []
+
     def register_ui_observer(self, ui_observer):
         self.ui_observer = ui_observer
 
@@ -39,19 +37,47 @@ class MonsterField:
             field_monster.process_events(event)
 
     def update(self, delta_time: float):
-        while not self.monster_sound_queue.empty():
-            sound_event = self.monster_sound_queue.get()
-            if sound_event.monster_id in self.draggable_monsters:
-                self.draggable_monsters[sound_event.monster_id].set_active(
-                    sound_event.on
-                )
+        for monster_id, field_monster in self.draggable_monsters.items():
+            # Monsters being dragged stay highlighted
+            if not field_monster.dragging:
+                field_monster.set_active(self.activity.is_active(monster_id))
 
-        for field_monster in self.draggable_monsters.values():
             field_monster.update(delta_time)
 
-    def render(self, screen: pygame.Surface):
+    def dirty_rects(self) -> list[pygame.Rect]:
+        """Returns the areas of the screen that changed since the monsters
+        were last drawn."""
+        rects = self.removed_rects
+        self.removed_rects = []
         for field_monster in self.draggable_monsters.values():
-            field_monster.render(screen)
+            if field_monster.dirty:
+                rects.extend(field_monster.dirty_rects())
+
+        return rects
+
+    def render(self, screen: pygame.Surface, rects: list[pygame.Rect] | None = None):
+        """Draws the monsters.
+
+        Parameters
+        ----------
+        screen : pygame.Surface
+            The surface to draw on.
+        rects : list[pygame.Rect] | None, optional
+            If given, only these areas of the screen are drawn,
+            and only the monsters on them.
+        """
+        if rects is None:
+            for field_monster in self.draggable_monsters.values():
+                field_monster.render(screen)
+            return
+
+        field_monsters = list(self.draggable_monsters.values())
+        monster_rects = [field_monster.rect() for field_monster in field_monsters]
+        for rect in rects:
+            screen.set_clip(rect)
+            for index in rect.collidelistall(monster_rects):
+                field_monsters[index].render(screen)
+        screen.set_clip(None)
 
     def add_monster(self, draggable_monster: DraggableMonster):
         monster = draggable_monster.monster_type(draggable_monster.position)
@@ -74,6 +100,8 @@ class MonsterField:
     def remove_monster(self, monster_id: int):
         self.monsters.remove_monster(monster_id)
         self.draggable_monsters[monster_id].unregister_observer(self)
+        if self.draggable_monsters[monster_id].drawn_rect is not None:
+            self.removed_rects.append(self.draggable_monsters[monster_id].drawn_rect)
         del self.draggable_monsters[monster_id]
 
     def on_dragging_started(self, draggable_monster: DraggableMonster):
@@ -1,6 +1,10 @@
 """This module contains functions for generating Euclidean rhythms.
 """
 
+from functools import lru_cache
+
+import numpy as np
+
 
 def euclidean_rhythm(
     steps: int, hits: int, accents: int, rotation: int = 0, accent_rotation: int = 0
@@ -78,7 +82,85 @@ def euclidean_rhythm_simple(steps: int, hits: int, rotation: int = 0) -> list[in
     if hits == 0 or steps == 0:
         return [0]
 
-    pattern = []
+    counts, remainders = euclidean_levels(steps, hits)
+
+    # The pattern of each level is built from the two levels below it,
+    # starting from a rest and a hit
+    lower, pattern = [1], [0]
+    for count, remainder in zip(counts, remainders):
+        level_pattern = pattern * count
+        if remainder != 0:
+            level_pattern += lower
+        lower, pattern = pattern, level_pattern
+
+    i = pattern.index(1)
+    i = (i - rotation) % steps
+    pattern = pattern[i:] + pattern[0:i]
+
+    return pattern
+
+
+def euclidean_rhythm_array(steps: int, hits: int, rotation: int = 0) -> np.ndarray:
+    """Generates an Euclidean rhythm as a NumPy array.
+
+    The rhythm is the same as the one of ``euclidean_rhythm_simple``.
+
+    Parameters
+    ----------
+    steps : int
+        The total number of steps in the rhythm.
+
+    hits : int
+        The number of hits in the rhythm.
+
+    rotation : int, optional
+        The rotation value for the rhythm.
+
+    Returns
+    -------
+    np.ndarray
+        An int8 array representing the Euclidean rhythm,
+        where 1 denotes a hit and 0 denotes a rest.
+    """
+    hits = min(steps, hits)
+
+    if hits == 0 or steps == 0:
+        return np.zeros(1, dtype=np.int8)
+
+    counts, remainders = euclidean_levels(steps, hits)
+
+    lower = np.ones(1, dtype=np.int8)
+    pattern = np.zeros(1, dtype=np.int8)
+    for count, remainder in zip(counts, remainders):
+        level_pattern = np.tile(pattern, count)
+        if remainder != 0:
+            level_pattern = np.concatenate((level_pattern, lower))
+        lower, pattern = pattern, level_pattern
+
+    i = int(np.argmax(pattern))
+    i = (i - rotation) % steps
+
+    return np.roll(pattern, -i)
+
+
+def euclidean_levels(steps: int, hits: int) -> tuple[list[int], list[int]]:
+    """Divides the rests among the hits, as in Bjorklund's algorithm.
+
+    Parameters
+    ----------
+    steps : int
+        The total number of steps in the rhythm.
+
+    hits : int
+        The number of hits in the rhythm, at least 1 and at most ``steps``.
+
+    Returns
+    -------
+    tuple[list[int], list[int]]
+        For each level, from the bottom, the number of times the pattern
+        of the level below is repeated, and the remainder that decides if
+        the pattern two levels below follows it.
+    """
     counts = []
     remainders = []
     divisor = steps - hits
@@ -95,21 +177,93 @@ def euclidean_rhythm_simple(steps: int, hits: int, rotation: int = 0) -> list[in
 
     counts.append(divisor)
 
-    def build(level):
-        if level == -1:
-            pattern.append(0)
-        elif level == -2:
-            pattern.append(1)
-        else:
-            for _ in range(0, counts[level]):
-                build(level - 1)
+    return counts, remainders
 
-            if remainders[level] != 0:
-                build(level - 2)
 
-    build(level)
-    i = pattern.index(1)
-    i = (i - rotation) % steps
-    pattern = pattern[i:] + pattern[0:i]
+class EuclideanPattern:
+    """An Euclidean rhythm with accents, in the forms a player needs.
 
-    return pattern
+    Patterns are shared between every plugin that uses the same
+    parameters, so they are never modified.
+
+    Attributes
+    ----------
+    rhythm : tuple[int, ...]
+        The rhythm, as returned by ``euclidean_rhythm``.
+    onsets : tuple[tuple[int, int], ...]
+        The value of each hit or accent in the rhythm, in order,
+        with the number of rests that follow it before the next one.
+    positions : tuple[int, ...]
+        The step of each onset.
+    next_onset : tuple[int, ...]
+        For each step, the index of the first onset at or after it,
+        wrapping around to the start of the rhythm.
+    onset_values : np.ndarray
+        The value of each onset, as a read-only array.
+    onset_gaps : np.ndarray
+        The number of rests after each onset, as a read-only array.
+    """
+
+    def __init__(self, rhythm: tuple[int, ...]):
+        self.rhythm = rhythm
+        self.positions = tuple(step for step, value in enumerate(rhythm) if value != 0)
+
+        onsets = []
+        for index, position in enumerate(self.positions):
+            next_position = self.positions[(index + 1) % len(self.positions)]
+            gap = (next_position - position - 1) % len(rhythm)
+            onsets.append((rhythm[position], gap))
+
+        next_onset = []
+        onset = 0
+        for step in range(len(rhythm)):
+            while onset < len(self.positions) and self.positions[onset] < step:
+                onset += 1
+            next_onset.append(onset % len(self.positions))
+
+        self.onsets = tuple(onsets)
+        self.next_onset = tuple(next_onset)
+
+        self.onset_values = np.array([value for value, _ in onsets])
+        self.onset_gaps = np.array([gap for _, gap in onsets])
+        self.onset_values.flags.writeable = False
+        self.onset_gaps.flags.writeable = False
+
+    def __len__(self) -> int:
+        return len(self.rhythm)
+
+
+@lru_cache(maxsize=1024)
+def euclidean_pattern(
+    steps: int, hits: int, accents: int, rotation: int = 0, accent_rotation: int = 0
+) -> EuclideanPattern:
+    """Returns the Euclidean rhythm with accents for the given parameters.
+
+    Patterns are cached for the whole process, and the cache statistics
+    are available through ``euclidean_pattern.cache_info()``.
+
+    Parameters
+    ----------
+    steps : int
+        The total number of steps in the rhythm.
+
+    hits : int
+        The number of hits in the rhythm.
+
+    accents : int
+        The number of accents in the rhythm.
+
+    rotation : int, optional
+        The rotation value for the rhythm.
+
+    accent_rotation : int, optional
+        The rotation value for the accents.
+
+    Returns
+    -------
+    EuclideanPattern
+        The rhythm, with its onsets precomputed.
+    """
+    return EuclideanPattern(
+        tuple(euclidean_rhythm(steps, hits, accents, rotation, accent_rotation))
+    )
@@ -1,5 +1,11 @@
+from abc import ABC, abstractmethod
+from functools import lru_cache
 from math import sqrt
 
+import numpy as np
+
+DIGIT_SUM_TABLE_SIZE = 4096
+
 
 def number_to_base(num: int, base: int) -> list[int]:
     """Converts a number to a list of digits in a given base.
@@ -71,6 +77,163 @@ def morse_thue_value(counter: int, base: int, multiplier: int) -> int:
     return sum_digits_base(counter, base)
 
 
+def morse_thue_block(start: int, count: int, base: int, multiplier: int) -> np.ndarray:
+    """Generates the Morse-Thue values for a run of consecutive counters.
+
+    The values are the same as calling ``morse_thue_value`` for each
+    counter from ``start`` to ``start + count - 1``, but the digits of all
+    the counters are summed together, one digit position at a time.
+
+    Parameters
+    ----------
+    start : int
+        The first counter value.
+
+    count : int
+        The number of values to generate.
+
+    base : int
+        The number base
+
+    multiplier : int
+        The multiplier value.
+
+    Returns
+    -------
+    np.ndarray
+        The Morse-Thue values, as 64 bit integers.
+    """
+    last = (start + count - 1) * multiplier
+    if base != int(base) or multiplier != int(multiplier) or last >= 2**63:
+        # Fractional parameters or huge counters are left to the scalar path
+        return np.array(
+            [
+                morse_thue_value(counter, base, multiplier)
+                for counter in range(start, start + count)
+            ],
+            dtype=np.int64,
+        )
+
+    table = digit_sum_table(int(base))
+    counters = np.arange(start, start + count, dtype=np.int64)
+    counters *= int(multiplier)
+    values = np.zeros(count, dtype=np.int64)
+    digits = np.empty(count, dtype=np.int64)
+
+    # Several digits are summed at once, and the largest counter has the most
+    for _ in range(len(number_to_base(last, len(table)))):
+        np.divmod(counters, len(table), out=(counters, digits))
+        values += table[digits]
+
+    return values
+
+
+@lru_cache(maxsize=None)
+def digit_sum_table(base: int) -> np.ndarray:
+    """Returns the sums of the digits of every number below a power of a base.
+
+    Parameters
+    ----------
+    base : int
+        The number base.
+
+    Returns
+    -------
+    np.ndarray
+        The read-only sums of the digits of the numbers from 0 to the
+        largest power of the base up to ``DIGIT_SUM_TABLE_SIZE``.
+    """
+    size = base
+    while size * base <= DIGIT_SUM_TABLE_SIZE:
+        size *= base
+
+    table = np.zeros(size, dtype=np.int64)
+    for number in range(1, size):
+        table[number] = table[number // base] + number % base
+
+    table.flags.writeable = False
+    return table
+
+
+class DigitSumCounter:
+    """The Morse-Thue value of a counter that only moves forward.
+
+    The digits of ``counter * multiplier`` are kept, least significant
+    first, and each step adds the multiplier to them with carry propagation,
+    so the value of the next counter is found without converting it again.
+    A step touches a constant number of digits on average, however large
+    the counter grows.
+
+    Attributes
+    ----------
+    base : int
+        The number base.
+    multiplier : int
+        The multiplier value.
+    counter : int
+        The counter value.
+    total : int
+        The Morse-Thue value of the counter.
+    """
+
+    __slots__ = (
+        "base",
+        "multiplier",
+        "counter",
+        "exact",
+        "int_base",
+        "int_multiplier",
+        "digits",
+        "total",
+    )
+
+    def __init__(self, base: int, multiplier: int, counter: int = 0):
+        self.rebuild(base, multiplier, counter)
+
+    def rebuild(self, base: int, multiplier: int, counter: int):
+        """Starts over from a counter, with a new base and multiplier."""
+        self.base = base
+        self.multiplier = multiplier
+        self.counter = counter
+        # Fractional parameters are left to the scalar path
+        self.exact = base == int(base) and multiplier == int(multiplier)
+
+        if self.exact:
+            self.int_base = int(base)
+            self.int_multiplier = int(multiplier)
+            self.digits = number_to_base(counter * self.int_multiplier, self.int_base)
+            self.digits.reverse()
+            self.total = sum(self.digits)
+        else:
+            self.digits = []
+            self.total = morse_thue_value(counter, base, multiplier)
+
+    def advance(self):
+        """Moves on to the next counter."""
+        self.counter += 1
+
+        if not self.exact:
+            self.total = morse_thue_value(self.counter, self.base, self.multiplier)
+            return
+
+        base = self.int_base
+        digits = self.digits
+        total = self.total
+        carry = self.int_multiplier
+        index = 0
+        while carry:
+            if index == len(digits):
+                digits.append(0)
+
+            digit = digits[index]
+            carry, new_digit = divmod(carry + digit, base)
+            digits[index] = new_digit
+            total += new_digit - digit
+            index += 1
+
+        self.total = total
+
+
 def logistic_map(x: float, k: float) -> float:
     """Calculates the logistic map for a given x and k.
 
@@ -90,7 +253,81 @@ def logistic_map(x: float, k: float) -> float:
     return k * x * (1 - x)
 
 
-def one_over_f(x: float, n: float, prev_logistic: float) -> tuple[float, float]:
+class ChaosSource(ABC):
+    """A chaotic map that drives a 1/f sequence."""
+
+    __slots__ = ()
+
+    @abstractmethod
+    def step(self, x: float) -> float:
+        """Returns the state that follows a state."""
+        pass
+
+    def steps(self, x: float, count: int, out: memoryview):
+        """Writes the ``count`` states that follow a state, in order,
+        into the start of a buffer of floats."""
+        for i in range(count):
+            x = self.step(x)
+            out[i] = x
+
+
+class LogisticMap(ChaosSource):
+    """The logistic map, which is chaotic for k close to 4.
+
+    Attributes
+    ----------
+    k : float
+        The k value.
+    """
+
+    __slots__ = ("k",)
+
+    def __init__(self, k: float = 4):
+        self.k = k
+
+    def step(self, x: float) -> float:
+        return logistic_map(x, self.k)
+
+    def steps(self, x: float, count: int, out: memoryview):
+        k = self.k
+        for i in range(count):
+            x = k * x * (1 - x)
+            out[i] = x
+
+
+class TentMap(ChaosSource):
+    """The tent map, which is chaotic for mu between 1 and 2.
+
+    With mu exactly 2 every state collapses to 0 after a few dozen steps
+    in floating point, so the default stays just below it.
+
+    Attributes
+    ----------
+    mu : float
+        The mu value.
+    """
+
+    __slots__ = ("mu",)
+
+    def __init__(self, mu: float = 1.99):
+        self.mu = mu
+
+    def step(self, x: float) -> float:
+        if x < 0.5:
+            return self.mu * x
+
+        return self.mu * (1 - x)
+
+    def steps(self, x: float, count: int, out: memoryview):
+        mu = self.mu
+        for i in range(count):
+            x = mu * x if x < 0.5 else mu * (1 - x)
+            out[i] = x
+
+
+def one_over_f(
+    x: float, n: float, prev_logistic: float, source: ChaosSource | None = None
+) -> tuple[float, float]:
     """Calculates the one over f value for a given x and n.
 
     Parameters
@@ -101,11 +338,87 @@ def one_over_f(x: float, n: float, prev_logistic: float) -> tuple[float, float]:
         The n value.
     prev_logistic : float
         The previous logistic map value.
+    source : ChaosSource | None, optional
+        The chaotic map that follows the previous logistic map value.
+        By default, it is the logistic map with k = 4.
 
     Returns
     -------
     tuple[float, float]
         The one over f value, and the logistic map value.
     """
-    r = logistic_map(prev_logistic, 4)
+    if source is None:
+        r = logistic_map(prev_logistic, 4)
+    else:
+        r = source.step(prev_logistic)
+
     return ((x * n) + (sqrt(1 - n**2) * r), r)
+
+
+class OneOverFGenerator:
+    """Generates runs of successive one over f values.
+
+    The values are the same as calling ``one_over_f`` once per value,
+    and are written into buffers that are allocated once and reused,
+    so the arrays returned are only valid until the next call.
+
+    Attributes
+    ----------
+    source : ChaosSource
+        The chaotic map that drives the values.
+    values : np.ndarray
+        The buffer of the one over f values.
+    states : np.ndarray
+        The buffer of the chaotic map states.
+    """
+
+    __slots__ = ("source", "values", "states", "value_view", "state_view")
+
+    def __init__(self, source: ChaosSource | None = None, capacity: int = 64):
+        self.source = source or LogisticMap(4)
+        self.allocate(capacity)
+
+    def allocate(self, capacity: int):
+        self.values = np.empty(capacity, dtype=np.float64)
+        self.states = np.empty(capacity, dtype=np.float64)
+
+        # Indexing memoryviews of the buffers reads and writes plain floats,
+        # which is much faster than indexing the arrays one value at a time
+        self.value_view = memoryview(self.values)
+        self.state_view = memoryview(self.states)
+
+    def generate(
+        self, count: int, x: float, n: float, prev_logistic: float
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Generates the next values of a one over f sequence.
+
+        Parameters
+        ----------
+        count : int
+            The number of values to generate.
+        x : float
+            The previous one over f value.
+        n : float
+            The n value.
+        prev_logistic : float
+            The previous chaotic map state.
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray]
+            The one over f values, and the chaotic map state after each one.
+            The last two make the state to carry on from.
+        """
+        if count > len(self.values):
+            self.allocate(count)
+
+        values = self.value_view
+        states = self.state_view
+        self.source.steps(prev_logistic, count, states)
+        scale = sqrt(1 - n**2)
+
+        for i in range(count):
+            x = (x * n) + (scale * states[i])
+            values[i] = x
+
+        return (self.values[:count], self.states[:count])
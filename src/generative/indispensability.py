@@ -1,9 +1,19 @@
+from functools import lru_cache
 from math import sqrt
 
+import numpy as np
 
-def prime_factors(n: int) -> list[int]:
+SIGNATURE_NOMINATORS = range(1, 17)
+SIGNATURE_DENOMINATORS = (1, 2, 4, 8, 16)
+METRIC_LEVELS = (16, 32, 64, 128)
+
+
+@lru_cache(maxsize=None)
+def prime_factors(n: int) -> tuple[int, ...]:
     """Returns the prime factors of a number.
 
+    Factorizations are cached, so they are only computed once.
+
     Parameters
     ----------
     n : int
@@ -11,7 +21,7 @@ def prime_factors(n: int) -> list[int]:
 
     Returns
     -------
-    list[int]
+    tuple[int, ...]
         The prime factors of the number.
     """
     i = 2
@@ -25,7 +35,7 @@ def prime_factors(n: int) -> list[int]:
     if n > 1:
         factors.append(n)
 
-    return factors
+    return tuple(factors)
 
 
 def time_signature_factors(
@@ -39,6 +49,8 @@ def time_signature_factors(
         The nominator of the time signature.
     denominator : int
         The denominator of the time signature.
+    metric_level : int, optional
+        The number of pulses in a whole note, by default 16.
 
     Returns
     -------
@@ -47,7 +59,7 @@ def time_signature_factors(
     """
     subdivisions = metric_level // denominator
 
-    return prime_factors(nominator) + prime_factors(subdivisions)
+    return list(prime_factors(nominator) + prime_factors(subdivisions))
 
 
 def product_top(z: int, factors: list[int]):
@@ -75,12 +87,52 @@ def pulse_weights(
     pulses = metric_level // denominator * nominator
     primes = [1] + primes + [1]
 
+    if pulses == 1:
+        # A single pulse is the downbeat, which gets the full weight
+        return [1.0]
+
     max_value = pulses - 1
-    indispensabilities = [
-        (indispensability(pulse, primes) / max_value) * 0.3 + 0.7
-        for pulse in range(1, pulses + 1)
-    ]
-    return indispensabilities
+    indispensabilities = indispensability_array(np.arange(1, pulses + 1), primes)
+    return (indispensabilities / max_value * 0.3 + 0.7).tolist()
+
+
+@lru_cache(maxsize=None)
+def pulse_weight_table(
+    nominator: int, denominator: int, metric_level: int = 16
+) -> tuple[float, ...]:
+    """Returns the weight of each pulse of a bar, computed once per meter.
+
+    Parameters
+    ----------
+    nominator : int
+        The nominator of the time signature.
+    denominator : int
+        The denominator of the time signature.
+    metric_level : int, optional
+        The number of pulses in a whole note, by default 16.
+
+    Returns
+    -------
+    tuple[float, ...]
+        The weights of ``pulse_weights``, which must not be modified
+        as they are shared by every caller.
+    """
+    return tuple(pulse_weights(nominator, denominator, metric_level))
+
+
+def precompute_pulse_weights(metric_levels: tuple[int, ...] = METRIC_LEVELS):
+    """Computes the pulse weights of every time signature that can be used,
+    so that changing the time signature does not compute them.
+
+    Parameters
+    ----------
+    metric_levels : tuple[int, ...], optional
+        The metric levels to compute the weights for, by default all of them.
+    """
+    for metric_level in metric_levels:
+        for nominator in SIGNATURE_NOMINATORS:
+            for denominator in SIGNATURE_DENOMINATORS:
+                pulse_weight_table(nominator, denominator, metric_level)
 
 
 def indispensability(pulse: int, primes: list[int]) -> int:
@@ -107,6 +159,54 @@ def indispensability(pulse: int, primes: list[int]) -> int:
     return sum
 
 
+def indispensability_array(pulses: np.ndarray, primes: list[int]) -> np.ndarray:
+    """Returns the indispensability of many pulses of a meter at once.
+
+    The values are the same as the ones of ``indispensability``,
+    but every pulse goes through each metric level together.
+
+    Parameters
+    ----------
+    pulses : np.ndarray
+        The pulses, starting at 1 for the downbeat.
+    primes : list[int]
+        The prime factors of the meter, between two 1s.
+
+    Returns
+    -------
+    np.ndarray
+        The indispensability of each pulse.
+    """
+    z = len(primes) - 2
+    top = product_top(z, primes)
+    sum = np.zeros(len(pulses), dtype=np.int64)
+    for r in range(z):
+        bot = product_bottom(z, r, primes)
+
+        mult = 1
+        for i in range(z - r):
+            mult *= primes[i]
+
+        modulo = primes[z - r]
+        temp = 1 + (1 + (pulses - 2) % top // bot) % modulo
+
+        sum += mult * basic_indispensability_table(modulo)[temp]
+
+    return sum
+
+
+@lru_cache(maxsize=None)
+def basic_indispensability_table(prime: int) -> np.ndarray:
+    """Returns the basic indispensability of every pulse of a prime,
+    indexed by pulse, starting at 1."""
+    table = np.zeros(prime + 1, dtype=np.int64)
+    for pulse in range(1, prime + 1):
+        table[pulse] = basic_indispensability(pulse, prime)
+
+    table.flags.writeable = False
+    return table
+
+
 def w_func(x: int) -> int:
     if x == 0:
         return 0
@@ -144,7 +244,7 @@ def basic_indispensability(pulse: int, prime: int) -> int:
 
     new_pulse = pulse - 1 + w_func(prime - pulse)
     factors = prime_factors(prime - 1)[::-1]
-    factors = [1] + factors + [1]
+    factors = [1, *factors, 1]
     q = indispensability(new_pulse, factors)
 
     return (q + w_func(int(q / (prime // 4)))) * w_func(prime - pulse - 1) + (
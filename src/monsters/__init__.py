@@ -1,9 +1,15 @@
 from abc import ABC, abstractmethod
+from collections import deque
+from math import ceil
 from typing import Callable
 
+import numpy as np
+
 from src.clock import Clock
 from src.plugins import MonsterPlugin
-from src.soundengine.sound import Sound
+from src.soundengine.scheduler import ActiveNotePool
+
+BLOCK_SIZE = 32
 
 
 class PluginParameter:
@@ -11,6 +17,8 @@ class PluginParameter:
     This is used to store the parameters of a plugin.
     """
 
+    __slots__ = ("name", "value", "min", "max", "save", "step")
+
     def __init__(
         self,
         name: str,
@@ -28,6 +36,63 @@ class PluginParameter:
         self.step = step
 
 
+class LookaheadEntry:
+    """A sound that a monster has generated but not played yet.
+
+    The sound is kept as the output of the plugin chain, and only turned
+    into a note when it is played, so that position changes apply to
+    sounds that are already in the buffer. Entries are reused by the
+    monster once their sound is played.
+
+    Attributes
+    ----------
+    init : float
+        The beat at which the sound starts.
+    note : int
+        The note returned by the plugin chain.
+    duration : float
+        The duration returned by the plugin chain.
+    rest : float
+        The rest returned by the plugin chain.
+    block_state : tuple
+        The state of the monster before the block this sound was generated in.
+    offset : int
+        The position of the sound in the block.
+    last_beat, last_duration, last_rest : float
+        The timing of the monster before this sound.
+    last_bar : int
+        The bar of the monster before this sound.
+
+    Rewinding to the block state, generating the sounds before the offset
+    again and restoring the timing makes the monster generate this sound again.
+    """
+
+    __slots__ = (
+        "init",
+        "note",
+        "duration",
+        "rest",
+        "block_state",
+        "offset",
+        "last_beat",
+        "last_duration",
+        "last_rest",
+        "last_bar",
+    )
+
+    def __init__(self):
+        self.init = 0.0
+        self.note = 0
+        self.duration = 0.0
+        self.rest = 0.0
+        self.block_state: tuple = ()
+        self.offset = 0
+        self.last_beat = 0.0
+        self.last_duration = 0.0
+        self.last_rest = 0.0
+        self.last_bar = 0
+
+
 class Monster(ABC):
     """
     A monster is a sound generator that can be placed on the screen.
@@ -40,16 +105,50 @@ class Monster(ABC):
         The position of the monster on the screen.
         It is a tuple of the x and y coordinates,
         ranging from 0 to 1.
+    lookahead : deque[LookaheadEntry]
+        The sounds that have been generated ahead of time,
+        in the order they will be played.
+    spare_entries : list[LookaheadEntry]
+        Entries of sounds that were played, to be reused.
+    plugins : list[MonsterPlugin]
+        The plugins that make the sounds of the monster, in order.
+    plugin_parameters : list[PluginParameter]
+        The parameters of the plugins that can be changed.
+
+    Every monster keeps its state in its own slots, and subclasses declare
+    slots for the attributes they add, so monsters have no ``__dict__``
+    and a scene can hold many thousands of them.
     """
 
-    next_sound: Sound | None = None
-    initialized: bool = False
-    plugins: list[MonsterPlugin] = []
-    plugin_parameters: list[PluginParameter] = []
-    last_beat: float = 0.0
-    last_duration: float = 0.0
-    last_rest: float = 0.0
-    last_bar: int = 0
+    __slots__ = (
+        "muted",
+        "position",
+        "channel",
+        "match_downbeat",
+        "lookahead",
+        "spare_entries",
+        "initialized",
+        "plugins",
+        "plugin_parameters",
+        "last_beat",
+        "last_duration",
+        "last_rest",
+        "last_bar",
+    )
+
+    muted: bool
+    position: tuple[float, float]
+    channel: int
+    match_downbeat: bool
+    lookahead: deque[LookaheadEntry]
+    spare_entries: list[LookaheadEntry]
+    initialized: bool
+    plugins: list[MonsterPlugin]
+    plugin_parameters: list[PluginParameter]
+    last_beat: float
+    last_duration: float
+    last_rest: float
+    last_bar: int
 
     @abstractmethod
     def __init__(self, position: tuple[float, float], channel: int = 0):
@@ -57,6 +156,16 @@ class Monster(ABC):
         self.position = position
         self.channel = channel
         self.match_downbeat = True
+        self.lookahead = deque()
+        self.spare_entries = []
+
+        self.initialized = False
+        self.plugins = []
+        self.plugin_parameters = []
+        self.last_beat = 0.0
+        self.last_duration = 0.0
+        self.last_rest = 0.0
+        self.last_bar = 0
 
     @abstractmethod
     def change_position(self, position: tuple[float, float]):
@@ -85,85 +194,256 @@ class Monster(ABC):
         """
         self.plugins.append(plugin)
 
-    def generate_next_sound(self, clock: Clock):
-        """Generates the next sound for the monster.
+    def set_plugin_parameter(self, parameter_index: int, value: float):
+        """Changes a plugin parameter of the monster.
+
+        Sounds that were generated with the old value and were not played yet
+        are thrown away, so the new value is heard from the next sound on.
+
+        Parameters
+        ----------
+        parameter_index : int
+            The index of the plugin parameter.
+        value : float
+            The new value of the plugin parameter.
+        """
+        self.invalidate_lookahead()
+        self.plugin_parameters[parameter_index].save(value)
+
+    def save_state(self) -> tuple:
+        return (
+            self.last_beat,
+            self.last_duration,
+            self.last_rest,
+            self.last_bar,
+            tuple(plugin.get_state() for plugin in self.plugins),
+        )
+
+    def restore_state(self, state: tuple):
+        (
+            self.last_beat,
+            self.last_duration,
+            self.last_rest,
+            self.last_bar,
+            plugin_states,
+        ) = state
+
+        for plugin, plugin_state in zip(self.plugins, plugin_states):
+            plugin.set_state(plugin_state)
+
+    def invalidate_lookahead(self):
+        """Throws away the sounds in the lookahead buffer.
+
+        The monster is rewound to the state it had before generating them,
+        so the sequences of its plugins carry on where playback is.
+        """
+        if self.lookahead:
+            self.rewind(self.lookahead[0])
+            self.spare_entries.extend(self.lookahead)
+            self.lookahead.clear()
+
+    def rewind(self, entry: LookaheadEntry):
+        """Brings the monster back to the state it had
+        right before generating a sound in the lookahead buffer.
+
+        The state of the block the sound was generated in is restored,
+        and the sounds before it in the block are generated again.
+        """
+        self.restore_state(entry.block_state)
+        if entry.offset > 0:
+            self.transform_block(entry.offset)
+
+        self.last_beat = entry.last_beat
+        self.last_duration = entry.last_duration
+        self.last_rest = entry.last_rest
+        self.last_bar = entry.last_bar
+
+    def transform_block(self, count: int) -> tuple[list, list, list]:
+        """Runs the next sounds through the plugin chain, all at once.
+
+        Parameters
+        ----------
+        count : int
+            The number of sounds.
+
+        Returns
+        -------
+        tuple[list, list, list]
+            The notes, durations, and rests of the sounds.
+        """
+        notes = np.zeros(count)
+        durations = np.zeros(count)
+        rests = np.zeros(count)
+
+        for plugin in self.plugins:
+            notes, durations, rests = plugin.transform_batch(notes, durations, rests)
+
+        return (notes.tolist(), durations.tolist(), rests.tolist())
+
+    def generate_next_sound(self, clock: Clock, lookahead_beats: float = 0.0):
+        """Generates the next sounds for the monster.
         This is so that monsters can pre-generate their sounds
         and then play them when needed.
 
+        Sounds are generated in blocks of up to ``BLOCK_SIZE``, until the
+        lookahead buffer reaches ``lookahead_beats`` past the current beat,
+        and there is always at least one sound in it.
+
         Parameters
         ----------
-        current_beat : float
-            The current beat of the clock.
+        clock : Clock
+            The clock of the sound engine.
+        lookahead_beats : float, optional
+            How many beats past the current beat the buffer should cover.
         """
-        if self.next_sound is None:
-            note = 0.0
-            duration = 0.0
-            rest = 0.0
+        until_beat = clock.current_beat + lookahead_beats
 
-            for plugin in self.plugins:
-                note, duration, rest = plugin.transform(note, duration, rest)
+        if self.needs_sounds(until_beat):
+            self.lookahead.extend(self.generate_sounds(clock, until_beat))
 
-            next_beat = self.last_beat + self.last_duration + self.last_rest
+    def needs_sounds(self, until_beat: float) -> bool:
+        """Returns whether the lookahead buffer has to be filled
+        to reach a beat."""
+        return not self.lookahead or self.lookahead[-1].init < until_beat
 
-            self.next_sound = self.generate_next_sound_internal(
-                next_beat, note, duration, rest
-            )
+    def block_size(self, until_beat: float) -> int:
+        """Estimates how many sounds reach a beat, following the last
+        generated sound, as if they were as long as it.
 
-            next_bar = int(
-                clock.beat_to_bar(
-                    self.next_sound.init + self.next_sound.duration + rest
-                )
-            )
-            # if self.match_downbeat and next_bar > self.last_bar:
-            #     beats_to_bar = clock.remaining_beats_to_bar(next_beat)
-            #     self.next_sound.duration = beats_to_bar
-            #     rest = 0
+        Returns
+        -------
+        int
+            The estimate, from 1 to ``BLOCK_SIZE``.
+        """
+        step = self.last_duration + self.last_rest
+        next_beat = self.last_beat + step
+        if step <= 0 or next_beat >= until_beat:
+            return 1
+
+        return min(BLOCK_SIZE, 1 + ceil((until_beat - next_beat) / step))
+
+    def generate_sounds(self, clock: Clock, until_beat: float) -> list[LookaheadEntry]:
+        """Generates blocks of sounds, following the last generated sound,
+        until one of them starts at or after a beat.
+
+        Blocks only hold the sounds estimated to reach the beat, so the
+        buffer does not run far past the lookahead window of slow monsters.
 
-            self.last_beat = next_beat
-            self.last_bar = next_bar
-            self.last_duration = self.next_sound.duration
-            self.last_rest = rest
+        The lookahead buffer is not touched, so this can run on another thread
+        while the buffer is being played, as long as nothing else changes
+        the plugins of the monster meanwhile. Only this takes entries from
+        the spare entries, while playing only puts them back.
+
+        Parameters
+        ----------
+        clock : Clock
+            The clock of the sound engine.
+        until_beat : float
+            The beat the sounds have to reach.
+
+        Returns
+        -------
+        list[LookaheadEntry]
+            The sounds, to be added to the lookahead buffer in order.
+        """
+        entries: list[LookaheadEntry] = []
+        spare_entries = self.spare_entries
+
+        while not entries or entries[-1].init < until_beat:
+            block_state = self.save_state()
+            count = self.block_size(until_beat)
+            notes, durations, rests = self.transform_block(count)
+
+            for offset in range(count):
+                duration = durations[offset]
+                rest = rests[offset]
+                next_beat = self.last_beat + self.last_duration + self.last_rest
+
+                entry = spare_entries.pop() if spare_entries else LookaheadEntry()
+                entry.init = next_beat
+                entry.note = notes[offset]
+                entry.duration = duration
+                entry.rest = rest
+                entry.block_state = block_state
+                entry.offset = offset
+                entry.last_beat = self.last_beat
+                entry.last_duration = self.last_duration
+                entry.last_rest = self.last_rest
+                entry.last_bar = self.last_bar
+                entries.append(entry)
+
+                next_bar = int(clock.beat_to_bar(next_beat + duration + rest))
+                # if self.match_downbeat and next_bar > self.last_bar:
+                #     beats_to_bar = clock.remaining_beats_to_bar(next_beat)
+                #     self.next_sound.duration = beats_to_bar
+                #     rest = 0
+
+                self.last_beat = next_beat
+                self.last_bar = next_bar
+                self.last_duration = duration
+                self.last_rest = rest
+
+        return entries
+
+    def next_sound_beat(self) -> float | None:
+        """Returns the beat at which the next sound starts, if it was generated."""
+        if not self.lookahead:
+            return None
+
+        return self.lookahead[0].init
 
     @abstractmethod
-    def generate_next_sound_internal(
-        self, next_beat: float, note: int, duration: float, rest: float
-    ) -> Sound:
+    def midi_note(self, note: int) -> int:
+        """Returns the MIDI note played for a note of the plugin chain."""
         pass
 
-    def make_sound(self, current_beat: float) -> Sound | None:
-        """Makes a sound for the monster.
-        If the monster is muted, then it will not make a sound.
-        If it is not time for the monster to make a sound,
-        then it will not make a sound.
+    @abstractmethod
+    def midi_velocity(self, note: int) -> int:
+        """Returns the velocity played for a note of the plugin chain."""
+        pass
 
-        This just gets the next sound from the monster, generated from
-        generate_next_sound, and returns it, if it is time for the monster
-        to make a sound.
+    def play_sound(
+        self, current_beat: float, sounds: ActiveNotePool, monster_id: int
+    ) -> int:
+        """Plays the next sound of the monster, if it is time to.
+        If the monster is muted, the sound is skipped.
+
+        This takes the next sound from the lookahead buffer, filled by
+        generate_next_sound, and writes its note straight into a slot of
+        the active notes, so no object is made for it.
 
         Parameters
         ----------
         current_beat : float
             The current beat of the clock.
+        sounds : ActiveNotePool
+            The notes that are being held.
+        monster_id : int
+            The ID of the monster.
 
         Returns
         -------
-        Sound | None
-            The sound that the monster made.
-            If the monster did not make a sound, then None is returned.
+        int
+            The slot of the note that was played, or -1 if none was.
         """
+        lookahead = self.lookahead
+        if not lookahead or current_beat < lookahead[0].init:
+            return -1
+
+        entry = lookahead.popleft()
+        index = -1
+        if not self.muted:
+            index = sounds.push(
+                monster_id,
+                self.channel,
+                self.midi_note(entry.note),
+                self.midi_velocity(entry.note),
+                entry.init,
+                entry.init + entry.duration,
+            )
 
-        if not self.muted and current_beat >= self.next_sound.init:
-            if self.next_sound is None:
-                self.generate_next_sound(current_beat)
-
-            sound = self.next_sound
-            self.next_sound = None
-            return sound
-
-        if self.muted and current_beat >= self.next_sound.init:
-            self.next_sound = None
-
-        return None
+        self.spare_entries.append(entry)
+        return index
 
     def mute(self):
         self.muted = True
@@ -18,20 +18,52 @@ class DraggableMonster:
         self.monster_image = monster_image
         self.monster_inactive_image = monster_inactive_image
         self.active_image = monster_inactive_image
-        self.position = initial_position
+        self._position = initial_position
         self.drag_start_position = initial_position
         self.monster_id = -1
         self.dragging = False
         self.observers: list[DraggableMonsterObserver] = []
 
+        # Whether the monster moved or changed image since it was drawn,
+        # and where it was drawn
+        self.dirty = True
+        self.drawn_rect: pygame.Rect | None = None
+
+    @property
+    def position(self) -> tuple[float, float]:
+        return self._position
+
+    @position.setter
+    def position(self, position: tuple[float, float]):
+        if position != self._position:
+            self._position = position
+            self.dirty = True
+
+    def rect(self) -> pygame.Rect:
+        """Returns the area of the screen the monster is drawn on."""
+        return self.active_image.get_rect(topleft=self._position)
+
+    def dirty_rects(self) -> list[pygame.Rect]:
+        """Returns the areas of the screen to redraw, where the monster
+        was drawn and where it is now, if it changed since it was drawn."""
+        if not self.dirty:
+            return []
+
+        if self.drawn_rect is None:
+            return [self.rect()]
+
+        return [self.drawn_rect, self.rect()]
+
     def set_monster_id(self, monster_id: int):
         self.monster_id = monster_id
 
     def set_active(self, active: bool):
-        if active:
-            self.active_image = self.monster_image
-        else:
-            self.active_image = self.monster_inactive_image
+        self.set_image(self.monster_image if active else self.monster_inactive_image)
+
+    def set_image(self, image: pygame.Surface):
+        if image is not self.active_image:
+            self.active_image = image
+            self.dirty = True
 
     def register_observer(self, observer):
         self.observers.append(observer)
@@ -43,14 +75,14 @@ class DraggableMonster:
         for observer in self.observers:
             observer.on_dragging_started(self)
         self.dragging = True
-        self.active_image = self.monster_image
+        self.set_image(self.monster_image)
         self.drag_start_position = self.position
 
     def stop_dragging(self):
         for observer in self.observers:
             observer.on_dragging_stopped(self)
         self.dragging = False
-        self.active_image = self.monster_inactive_image
+        self.set_image(self.monster_inactive_image)
 
     def process_events(self, event: pygame.event.Event):
         if event.type == pygame.MOUSEBUTTONDOWN:
@@ -90,7 +122,9 @@ class DraggableMonster:
             )
 
     def render(self, screen: pygame.Surface):
-        screen.blit(self.active_image, self.position)
+        screen.blit(self.active_image, self._position)
+        self.drawn_rect = self.rect()
+        self.dirty = False
 
 
 class DraggableMonsterObserver(ABC):
@@ -1,7 +1,6 @@
 from src.monsters import Monster, PluginParameter
 from src.plugins import ConstantDurationPlugin
 from src.plugins.euclidean import EuclideanRhythmPlugin
-from src.soundengine.sound import Sound
 
 
 class ThumpFoot(Monster):
@@ -17,6 +16,13 @@ class ThumpFoot(Monster):
         position of the monster.
     """
 
+    __slots__ = (
+        "starting_value",
+        "velocity",
+        "constant_duration_plugin",
+        "euclidean_rhythm_plugin",
+    )
+
     def __init__(
         self,
         position: tuple[float, float],
@@ -89,20 +95,22 @@ class ThumpFoot(Monster):
         self.starting_value = int(position[0] * 80) + 20
         self.velocity = int(position[1] * 80) + 20
 
-    def generate_next_sound_internal(
-        self, next_beat: float, note: int, duration: float, rest: float
-    ) -> Sound:
-        velocity = self.velocity
+    def midi_note(self, note: int) -> int:
         if note == 2:
-            note += 4
-            velocity += 20
+            return note + 4 + self.starting_value
+
+        return note + self.starting_value
 
-        return Sound(
-            self.channel, note + self.starting_value, velocity, next_beat, duration
-        )
+    def midi_velocity(self, note: int) -> int:
+        if note == 2:
+            return self.velocity + 20
+
+        return self.velocity
 
 
 class RattleSnare(ThumpFoot):
+    __slots__ = ()
+
     def __init__(
         self,
         position: tuple[float, float],
@@ -2,7 +2,6 @@ from src.monsters import Monster, PluginParameter
 from src.plugins import ConstantRestPlugin
 from src.plugins.fractal import FractalDurationPlugin, FractalNotePlugin, OneOverFPlugin
 from src.plugins.octaver import MultiplicativeOctavePlugin, OctavePlugin
-from src.soundengine.sound import Sound
 
 
 class EtherealEcho(Monster):
@@ -18,6 +17,15 @@ class EtherealEcho(Monster):
         position of the monster.
     """
 
+    __slots__ = (
+        "starting_value",
+        "velocity",
+        "fractal_note_plugin",
+        "fractal_duration_plugin",
+        "constant_rest_plugin",
+        "octave_plugin",
+    )
+
     def __init__(
         self,
         position: tuple[float, float],
@@ -102,12 +110,11 @@ class EtherealEcho(Monster):
         self.starting_value = int(position[0] * 80) + 20
         self.velocity = int(position[1] * 80) + 20
 
-    def generate_next_sound_internal(
-        self, next_beat: float, note: int, duration: float, rest: float
-    ) -> Sound:
-        return Sound(
-            self.channel, note + self.starting_value, self.velocity, next_beat, duration
-        )
+    def midi_note(self, note: int) -> int:
+        return note + self.starting_value
+
+    def midi_velocity(self, note: int) -> int:
+        return self.velocity
 
 
 class DarkEcho(EtherealEcho):
@@ -123,6 +130,8 @@ class DarkEcho(EtherealEcho):
         position of the monster.
     """
 
+    __slots__ = ()
+
     def __init__(
         self,
         position: tuple[float, float],
@@ -143,6 +152,8 @@ class Boris(EtherealEcho):
         position of the monster.
     """
 
+    __slots__ = ()
+
     def __init__(
         self,
         position: tuple[float, float],
@@ -163,6 +174,8 @@ class FusionCore(EtherealEcho):
         position of the monster.
     """
 
+    __slots__ = ()
+
     def __init__(
         self,
         position: tuple[float, float],
@@ -183,6 +196,15 @@ class HummingVenus(Monster):
         position of the monster.
     """
 
+    __slots__ = (
+        "starting_value",
+        "velocity",
+        "one_over_f_plugin",
+        "fractal_duration_plugin",
+        "constant_rest_plugin",
+        "octave_plugin",
+    )
+
     def __init__(
         self,
         position: tuple[float, float],
@@ -259,12 +281,11 @@ class HummingVenus(Monster):
         self.starting_value = int(position[0] * 80) + 20
         self.velocity = int(position[1] * 80) + 20
 
-    def generate_next_sound_internal(
-        self, next_beat: float, note: int, duration: float, rest: float
-    ) -> Sound:
-        return Sound(
-            self.channel, note + self.starting_value, self.velocity, next_beat, duration
-        )
+    def midi_note(self, note: int) -> int:
+        return note + self.starting_value
+
+    def midi_velocity(self, note: int) -> int:
+        return self.velocity
 
 
 class SonicScale(Monster):
@@ -280,6 +301,15 @@ class SonicScale(Monster):
         position of the monster.
     """
 
+    __slots__ = (
+        "starting_value",
+        "velocity",
+        "fractal_note_plugin",
+        "fractal_duration_plugin",
+        "constant_rest_plugin",
+        "octave_plugin",
+    )
+
     def __init__(
         self,
         position: tuple[float, float],
@@ -363,9 +393,8 @@ class SonicScale(Monster):
         self.starting_value = int(position[0] * 80) + 20
         self.velocity = int(position[1] * 80) + 20
 
-    def generate_next_sound_internal(
-        self, next_beat: float, note: int, duration: float, rest: float
-    ) -> Sound:
-        return Sound(
-            self.channel, note + self.starting_value, self.velocity, next_beat, duration
-        )
+    def midi_note(self, note: int) -> int:
+        return note + self.starting_value
+
+    def midi_velocity(self, note: int) -> int:
+        return self.velocity
@@ -1,11 +1,15 @@
 from abc import ABC, abstractmethod
 
+import numpy as np
+
 
 class MonsterPlugin(ABC):
     """A Plugin for a monster
     These plugins alter the notes, durations, and rests of a sound that a monster makes.
     """
 
+    __slots__ = ()
+
     @abstractmethod
     def transform(
         self, note: int, duration: float, rest: float
@@ -28,12 +32,59 @@ class MonsterPlugin(ABC):
         """
         pass
 
+    def transform_batch(
+        self, notes: np.ndarray, durations: np.ndarray, rests: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Transforms the notes, durations, and rests of the next sounds
+        that a monster makes, all at once.
+
+        The result is the same as calling ``transform`` for each sound
+        in order, which is what this does unless a plugin overrides it.
+
+        Parameters
+        ----------
+        notes : np.ndarray
+            The notes of the sounds.
+        durations : np.ndarray
+            The durations of the sounds.
+        rests : np.ndarray
+            The rests of the sounds.
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray, np.ndarray]
+            The transformed notes, durations, and rests.
+        """
+        results = [
+            self.transform(note, duration, rest)
+            for note, duration, rest in zip(
+                notes.tolist(), durations.tolist(), rests.tolist()
+            )
+        ]
+        notes, durations, rests = zip(*results)
+
+        return (np.array(notes), np.array(durations), np.array(rests))
+
+    def get_state(self) -> object:
+        """Returns the state that changes as the plugin transforms sounds.
+
+        Plugins that keep a sequence going between sounds override this,
+        so that the monster can rewind them.
+        """
+        return None
+
+    def set_state(self, state: object):
+        """Restores a state returned by get_state."""
+        pass
+
 
 class ConstantRestPlugin(MonsterPlugin):
     """A Plugin for a monster
     These plugins alter the notes, durations, and rests of a sound that a monster makes.
     """
 
+    __slots__ = ("rest",)
+
     def __init__(self, rest: float):
         self.rest = rest
 
@@ -64,12 +115,36 @@ class ConstantRestPlugin(MonsterPlugin):
         """
         return (note, duration, self.rest)
 
+    def transform_batch(
+        self, notes: np.ndarray, durations: np.ndarray, rests: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Transforms the notes, durations, and rests of the next sounds
+        that a monster makes, all at once.
+
+        Parameters
+        ----------
+        notes : np.ndarray
+            The notes of the sounds.
+        durations : np.ndarray
+            The durations of the sounds.
+        rests : np.ndarray
+            The rests of the sounds.
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray, np.ndarray]
+            The transformed notes, durations, and rests.
+        """
+        return (notes, durations, np.full(len(rests), self.rest))
+
 
 class ConstantDurationPlugin(MonsterPlugin):
     """A Plugin for a monster
     These plugins alter the notes, durations, and rests of a sound that a monster makes.
     """
 
+    __slots__ = ("duration",)
+
     def __init__(self, duration: float):
         self.duration = duration
 
@@ -97,3 +172,25 @@ class ConstantDurationPlugin(MonsterPlugin):
             The transformed note, duration, and rest.
         """
         return (note, self.duration, rest)
+
+    def transform_batch(
+        self, notes: np.ndarray, durations: np.ndarray, rests: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Transforms the notes, durations, and rests of the next sounds
+        that a monster makes, all at once.
+
+        Parameters
+        ----------
+        notes : np.ndarray
+            The notes of the sounds.
+        durations : np.ndarray
+            The durations of the sounds.
+        rests : np.ndarray
+            The rests of the sounds.
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray, np.ndarray]
+            The transformed notes, durations, and rests.
+        """
+        return (notes, np.full(len(durations), self.duration), rests)
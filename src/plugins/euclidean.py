@@ -1,4 +1,6 @@
-from src.generative.euclidean import euclidean_rhythm
+import numpy as np
+
+from src.generative.euclidean import euclidean_pattern
 from src.plugins import MonsterPlugin
 
 
@@ -18,8 +20,22 @@ class EuclideanRhythmPlugin(MonsterPlugin):
         The rotation of the rhythm.
     accent_rotation : int
         The accent rotation of the rhythm.
+    pattern : EuclideanPattern
+        The rhythm, shared with every plugin with the same parameters.
+    counter : int
+        The step of the rhythm the next note is looked for from.
     """
 
+    __slots__ = (
+        "steps",
+        "hits",
+        "accents",
+        "rotation",
+        "accent_rotation",
+        "pattern",
+        "counter",
+    )
+
     def __init__(
         self, steps: int, hits: int, accents: int, rotation: int, accent_rotation: int
     ):
@@ -28,11 +44,13 @@ class EuclideanRhythmPlugin(MonsterPlugin):
         self.accents = accents
         self.rotation = rotation
         self.accent_rotation = accent_rotation
-        self.rhythm = euclidean_rhythm(steps, hits, accents, rotation, accent_rotation)
+        self.pattern = euclidean_pattern(
+            steps, hits, accents, rotation, accent_rotation
+        )
         self.counter = 0
 
     def reset_rhythm(self):
-        self.rhythm = euclidean_rhythm(
+        self.pattern = euclidean_pattern(
             self.steps, self.hits, self.accents, self.rotation, self.accent_rotation
         )
         self.counter = self.counter % self.steps
@@ -72,6 +90,12 @@ class EuclideanRhythmPlugin(MonsterPlugin):
     def get_accent_rotation(self) -> int:
         return self.accent_rotation
 
+    def get_state(self) -> int:
+        return self.counter
+
+    def set_state(self, state: int):
+        self.counter = state
+
     def transform(
         self, _: int, duration: float, rest: float
     ) -> tuple[int, float, float]:
@@ -91,25 +115,41 @@ class EuclideanRhythmPlugin(MonsterPlugin):
         tuple[int, float, float]
             The transformed note, duration, and rest.
         """
-        # Find the next non-zero value in the rhythm
-        while self.rhythm[self.counter] == 0:
-            self.counter += 1
-            self.counter %= self.steps
-
-        note = self.rhythm[self.counter]
-
-        # Find how long the note should be
-        self.counter += 1
-        self.counter %= self.steps
-        rest = 0
-        while self.rhythm[self.counter] == 0:
-            rest += duration
-            self.counter += 1
-            self.counter %= self.steps
-
-        result = (
-            note,
-            duration,
-            rest,
+        # The next note is the first onset from the counter,
+        # and it lasts until the onset after it
+        onset = self.pattern.next_onset[self.counter]
+        note, gap = self.pattern.onsets[onset]
+        self.counter = self.pattern.positions[(onset + 1) % len(self.pattern.onsets)]
+
+        return (note, duration, gap * duration)
+
+    def transform_batch(
+        self, notes: np.ndarray, durations: np.ndarray, rests: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Transforms the notes, durations, and rests of the next sounds
+        that a monster makes, all at once.
+
+        Parameters
+        ----------
+        notes : np.ndarray
+            The notes of the sounds.
+        durations : np.ndarray
+            The durations of the sounds.
+        rests : np.ndarray
+            The rests of the sounds.
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray, np.ndarray]
+            The transformed notes, durations, and rests.
+        """
+        pattern = self.pattern
+        onsets = pattern.next_onset[self.counter] + np.arange(len(notes))
+        onsets %= len(pattern.onsets)
+        self.counter = pattern.positions[(onsets[-1] + 1) % len(pattern.onsets)]
+
+        return (
+            pattern.onset_values[onsets],
+            durations,
+            pattern.onset_gaps[onsets] * durations,
         )
-        return result
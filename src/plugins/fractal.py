@@ -1,3 +1,5 @@
+import numpy as np
+
 from src.generative import fractal
 from src.plugins import MonsterPlugin
 
@@ -14,18 +16,25 @@ class FractalNotePlugin(MonsterPlugin):
         The multiplier of the Morse-Thue sequence.
     counter : int
         The counter of the Morse-Thue sequence.
+    digit_sum : fractal.DigitSumCounter
+        The value of the sequence at the counter.
     """
 
+    __slots__ = ("base", "multiplier", "counter", "digit_sum")
+
     def __init__(self, base: int, multiplier: int):
         self.base = base
         self.multiplier = multiplier
         self.counter = 0
+        self.digit_sum = fractal.DigitSumCounter(base, multiplier)
 
     def set_base(self, base: int):
         self.base = base
+        self.digit_sum.rebuild(self.base, self.multiplier, self.counter)
 
     def set_multiplier(self, multiplier: int):
         self.multiplier = multiplier
+        self.digit_sum.rebuild(self.base, self.multiplier, self.counter)
 
     def get_base(self) -> int:
         return self.base
@@ -33,6 +42,13 @@ class FractalNotePlugin(MonsterPlugin):
     def get_multiplier(self) -> int:
         return self.multiplier
 
+    def get_state(self) -> int:
+        return self.counter
+
+    def set_state(self, state: int):
+        self.counter = state
+        self.digit_sum.rebuild(self.base, self.multiplier, self.counter)
+
     def transform(
         self, _: int, duration: float, rest: float
     ) -> tuple[int, float, float]:
@@ -52,14 +68,38 @@ class FractalNotePlugin(MonsterPlugin):
         tuple[int, float, float]
             The transformed note, duration, and rest.
         """
-        result = (
-            fractal.morse_thue_value(self.counter, self.base, self.multiplier),
-            duration,
-            rest,
-        )
+        result = (self.digit_sum.total, duration, rest)
         self.counter += 1
+        self.digit_sum.advance()
         return result
 
+    def transform_batch(
+        self, notes: np.ndarray, durations: np.ndarray, rests: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Transforms the notes, durations, and rests of the next sounds
+        that a monster makes, all at once.
+
+        Parameters
+        ----------
+        notes : np.ndarray
+            The notes of the sounds.
+        durations : np.ndarray
+            The durations of the sounds.
+        rests : np.ndarray
+            The rests of the sounds.
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray, np.ndarray]
+            The transformed notes, durations, and rests.
+        """
+        notes = fractal.morse_thue_block(
+            self.counter, len(notes), self.base, self.multiplier
+        )
+        self.set_state(self.counter + len(notes))
+
+        return (notes, durations, rests)
+
 
 class FractalDurationPlugin(MonsterPlugin):
     """A Plugin for a monster
@@ -73,8 +113,19 @@ class FractalDurationPlugin(MonsterPlugin):
         The multiplier of the Morse-Thue sequence.
     counter : int
         The counter of the Morse-Thue sequence.
+    digit_sum : fractal.DigitSumCounter
+        The value of the sequence at the counter.
     """
 
+    __slots__ = (
+        "base",
+        "multiplier",
+        "starting_duration",
+        "max_duration",
+        "counter",
+        "digit_sum",
+    )
+
     def __init__(
         self,
         base: int,
@@ -87,12 +138,15 @@ class FractalDurationPlugin(MonsterPlugin):
         self.starting_duration = starting_duration
         self.max_duration = max_duration
         self.counter = 0
+        self.digit_sum = fractal.DigitSumCounter(base, multiplier)
 
     def set_base(self, base: int):
         self.base = base
+        self.digit_sum.rebuild(self.base, self.multiplier, self.counter)
 
     def set_multiplier(self, multiplier: int):
         self.multiplier = multiplier
+        self.digit_sum.rebuild(self.base, self.multiplier, self.counter)
 
     def set_starting_duration(self, starting_duration: float):
         self.starting_duration = starting_duration
@@ -112,6 +166,13 @@ class FractalDurationPlugin(MonsterPlugin):
     def get_max_duration(self) -> float:
         return self.max_duration
 
+    def get_state(self) -> int:
+        return self.counter
+
+    def set_state(self, state: int):
+        self.counter = state
+        self.digit_sum.rebuild(self.base, self.multiplier, self.counter)
+
     def transform(self, note: int, _: float, rest: float) -> tuple[int, float, float]:
         """Transforms the note, duration, and rest of a sound that a monster makes.
 
@@ -129,12 +190,41 @@ class FractalDurationPlugin(MonsterPlugin):
         tuple[int, float, float]
             The transformed note, duration, and rest.
         """
-        duration = fractal.morse_thue_value(self.counter, self.base, self.multiplier)
-        duration = duration % (self.max_duration)
+        duration = self.digit_sum.total % (self.max_duration)
         duration = self.starting_duration / (2**duration)
         self.counter += 1
+        self.digit_sum.advance()
         return (note, duration, rest)
 
+    def transform_batch(
+        self, notes: np.ndarray, durations: np.ndarray, rests: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Transforms the notes, durations, and rests of the next sounds
+        that a monster makes, all at once.
+
+        Parameters
+        ----------
+        notes : np.ndarray
+            The notes of the sounds.
+        durations : np.ndarray
+            The durations of the sounds.
+        rests : np.ndarray
+            The rests of the sounds.
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray, np.ndarray]
+            The transformed notes, durations, and rests.
+        """
+        durations = fractal.morse_thue_block(
+            self.counter, len(durations), self.base, self.multiplier
+        )
+        durations = durations % (self.max_duration)
+        durations = self.starting_duration / (2.0**durations)
+        self.set_state(self.counter + len(durations))
+
+        return (notes, durations, rests)
+
 
 class OneOverFPlugin(MonsterPlugin):
     """A Plugin for a monster
@@ -148,12 +238,17 @@ class OneOverFPlugin(MonsterPlugin):
         The previous value of the one over f sequence.
     prev_log : float
         The previous logistic map value of the one over f sequence.
+    generator : fractal.OneOverFGenerator
+        Generates the sequence, driven by a chaotic map.
     """
 
-    def __init__(self, n: int):
+    __slots__ = ("n", "prev", "prev_log", "generator")
+
+    def __init__(self, n: int, source: fractal.ChaosSource | None = None):
         self.n = n
         self.prev = 0
         self.prev_log = 0.4
+        self.generator = fractal.OneOverFGenerator(source)
 
     def set_n(self, n: int):
         self.n = n
@@ -161,6 +256,12 @@ class OneOverFPlugin(MonsterPlugin):
     def get_n(self) -> int:
         return self.n
 
+    def get_state(self) -> tuple[float, float]:
+        return (self.prev, self.prev_log)
+
+    def set_state(self, state: tuple[float, float]):
+        self.prev, self.prev_log = state
+
     def transform(
         self, _: int, duration: float, rest: float
     ) -> tuple[int, float, float]:
@@ -180,10 +281,40 @@ class OneOverFPlugin(MonsterPlugin):
         tuple[int, float, float]
             The transformed note, duration, and rest.
         """
-        self.prev, self.prev_log = fractal.one_over_f(self.prev, self.n, self.prev_log)
+        self.prev, self.prev_log = fractal.one_over_f(
+            self.prev, self.n, self.prev_log, self.generator.source
+        )
 
         return (
             self.prev,
             duration,
             rest,
         )
+
+    def transform_batch(
+        self, notes: np.ndarray, durations: np.ndarray, rests: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Transforms the notes, durations, and rests of the next sounds
+        that a monster makes, all at once.
+
+        Parameters
+        ----------
+        notes : np.ndarray
+            The notes of the sounds.
+        durations : np.ndarray
+            The durations of the sounds.
+        rests : np.ndarray
+            The rests of the sounds.
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray, np.ndarray]
+            The transformed notes, durations, and rests.
+        """
+        notes, states = self.generator.generate(
+            len(notes), self.prev, self.n, self.prev_log
+        )
+        self.prev = notes[-1].item()
+        self.prev_log = states[-1].item()
+
+        return (notes, durations, rests)
@@ -1,3 +1,5 @@
+import numpy as np
+
 from src.plugins import MonsterPlugin
 from src.utils import octaver
 from src.utils.scales import compute_scale
@@ -9,6 +11,8 @@ class OctavePlugin(MonsterPlugin):
     These plugins alter the notes, durations, and rests of a sound that a monster makes.
     """
 
+    __slots__ = ("scale", "interval_num", "num_octaves")
+
     def __init__(self, intervals: int, num_octaves: int = 2):
         self.set_intervals(intervals)
         self.interval_num = intervals
@@ -48,12 +52,42 @@ class OctavePlugin(MonsterPlugin):
         """
         return (octaver(self.scale, self.num_octaves, note), duration, rest)
 
+    def transform_batch(
+        self, notes: np.ndarray, durations: np.ndarray, rests: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Transforms the notes, durations, and rests of the next sounds
+        that a monster makes, all at once.
+
+        Parameters
+        ----------
+        notes : np.ndarray
+            The notes of the sounds.
+        durations : np.ndarray
+            The durations of the sounds.
+        rests : np.ndarray
+            The rests of the sounds.
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray, np.ndarray]
+            The transformed notes, durations, and rests.
+        """
+        if not np.issubdtype(notes.dtype, np.integer):
+            return super().transform_batch(notes, durations, rests)
+
+        scale = np.array(self.scale)
+        octaves = notes // len(scale) % self.num_octaves
+
+        return (scale[notes % len(scale)] + 12 * octaves, durations, rests)
+
 
 class MultiplicativeOctavePlugin(OctavePlugin):
     """A Plugin for a monster
     These plugins alter the notes, durations, and rests of a sound that a monster makes.
     """
 
+    __slots__ = ("min_value", "max_value")
+
     def __init__(
         self,
         intervals: int,
@@ -65,6 +99,12 @@ class MultiplicativeOctavePlugin(OctavePlugin):
         self.min_value = min_value
         self.max_value = max_value
 
+    def get_state(self) -> tuple[int, int]:
+        return (self.min_value, self.max_value)
+
+    def set_state(self, state: tuple[int, int]):
+        self.min_value, self.max_value = state
+
     def transform(
         self, note: int, duration: float, rest: float
     ) -> tuple[int, float, float]:
@@ -95,3 +135,38 @@ class MultiplicativeOctavePlugin(OctavePlugin):
         note = int(note * len(self.scale) * self.num_octaves)
 
         return (octaver(self.scale, self.num_octaves, note), duration, rest)
+
+    def transform_batch(
+        self, notes: np.ndarray, durations: np.ndarray, rests: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Transforms the notes, durations, and rests of the next sounds
+        that a monster makes, all at once.
+
+        Parameters
+        ----------
+        notes : np.ndarray
+            The notes of the sounds.
+        durations : np.ndarray
+            The durations of the sounds.
+        rests : np.ndarray
+            The rests of the sounds.
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray, np.ndarray]
+            The transformed notes, durations, and rests.
+        """
+        # The range each note is scaled to includes the notes before it
+        min_values = np.minimum.accumulate(np.append(self.min_value, notes))[1:]
+        max_values = np.maximum.accumulate(np.append(self.max_value, notes))[1:]
+
+        if min_values[-1] < self.min_value:
+            self.min_value = min_values[-1].item()
+        if max_values[-1] > self.max_value:
+            self.max_value = max_values[-1].item()
+
+        notes = (notes - min_values) / (max_values - min_values)
+        notes = np.clip(notes, 0, 1)
+        notes = (notes * len(self.scale) * self.num_octaves).astype(np.int64)
+
+        return super().transform_batch(notes, durations, rests)
@@ -0,0 +1,54 @@
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+
+class ActivityTable:
+    """The number of notes each monster is holding,
+    shared between the sound engine and the GUI processes.
+
+    The sound engine is the only writer, and the GUI reads the table every
+    frame, so no messages or locks are needed to show which monsters are
+    playing. Monsters are indexed by their ID modulo the capacity.
+
+    Parameters
+    ----------
+    capacity : int
+        The number of monsters the table can hold.
+    name : str | None, optional
+        The name of an existing table to attach to.
+        If not given, a new table is created.
+    """
+
+    def __init__(self, capacity: int, name: str | None = None):
+        self.capacity = capacity
+        self.owner = name is None
+        self.memory = SharedMemory(
+            name=name, create=self.owner, size=capacity * np.dtype(np.int32).itemsize
+        )
+        self.counts = np.ndarray((capacity,), dtype=np.int32, buffer=self.memory.buf)
+
+        if self.owner:
+            self.counts[:] = 0
+
+    @property
+    def name(self) -> str:
+        return self.memory.name
+
+    def note_on(self, monster_id: int):
+        self.counts[monster_id % self.capacity] += 1
+
+    def note_off(self, monster_id: int):
+        self.counts[monster_id % self.capacity] -= 1
+
+    def is_active(self, monster_id: int) -> bool:
+        return self.counts[monster_id % self.capacity] > 0
+
+    def close(self):
+        """Detaches from the table, and frees it if this process created it."""
+        # The array has to go before the memory it points to
+        del self.counts
+        self.memory.close()
+
+        if self.owner:
+            self.memory.unlink()
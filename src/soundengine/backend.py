@@ -0,0 +1,142 @@
+from abc import ABC, abstractmethod
+from time import perf_counter
+from typing import Callable
+
+import numpy as np
+
+from src.clock import Clock
+
+NOTE_ON = 0
+NOTE_OFF = 1
+PROGRAM_SELECT = 2
+ALL_NOTES_OFF = 3
+
+EVENT_DTYPE = np.dtype(
+    [
+        ("time", np.float64),
+        ("kind", np.uint8),
+        ("channel", np.uint8),
+        ("note", np.int16),
+        ("velocity", np.int16),
+    ]
+)
+
+
+class SynthBackend(ABC):
+    """A synth that the sound engine plays sounds on.
+
+    Implementations decide what is done with the MIDI events,
+    e.g. playing them on an audio device or just recording them.
+    """
+
+    @abstractmethod
+    def noteon(self, channel: int, note: int, velocity: int):
+        pass
+
+    @abstractmethod
+    def noteoff(self, channel: int, note: int):
+        pass
+
+    @abstractmethod
+    def program_select(self, channel: int, bank: int, preset: int):
+        """Selects the instrument of a channel.
+
+        Parameters
+        ----------
+        channel : int
+            The MIDI channel.
+        bank : int
+            The bank of the instrument in the soundfont.
+        preset : int
+            The preset of the instrument in the bank.
+        """
+        pass
+
+    @abstractmethod
+    def all_notes_off(self, channel: int):
+        pass
+
+    def clock_changed(self, clock: Clock):
+        """Called when the tempo or time signature of the clock changes."""
+        pass
+
+    def delete(self):
+        """Frees the resources of the synth."""
+        pass
+
+
+class NullBackend(SynthBackend):
+    """A synth that plays nothing and only counts the events it receives."""
+
+    def __init__(self):
+        self.noteons = 0
+        self.noteoffs = 0
+        self.program_selects = 0
+        self.all_notes_offs = 0
+
+    def noteon(self, channel: int, note: int, velocity: int):
+        self.noteons += 1
+
+    def noteoff(self, channel: int, note: int):
+        self.noteoffs += 1
+
+    def program_select(self, channel: int, bank: int, preset: int):
+        self.program_selects += 1
+
+    def all_notes_off(self, channel: int):
+        self.all_notes_offs += 1
+
+
+class RecordingBackend(SynthBackend):
+    """A synth that plays nothing and timestamps every event it receives.
+
+    Events are written into an array allocated up front, so recording
+    does not allocate while the engine is running. Events that do not fit
+    are counted in ``dropped`` instead of recorded.
+
+    Attributes
+    ----------
+    events : np.ndarray
+        The recorded events, with the time, kind, channel, note and velocity
+        of each event. Only the first ``size`` entries are valid.
+    size : int
+        The number of recorded events.
+    dropped : int
+        The number of events that did not fit in the array.
+    """
+
+    def __init__(
+        self, capacity: int = 1_000_000, time: Callable[[], float] = perf_counter
+    ):
+        self.events = np.zeros(capacity, dtype=EVENT_DTYPE)
+        self.size = 0
+        self.dropped = 0
+        self.time = time
+
+    def record(self, kind: int, channel: int, note: int, velocity: int):
+        if self.size == len(self.events):
+            self.dropped += 1
+            return
+
+        self.events[self.size] = (self.time(), kind, channel, note, velocity)
+        self.size += 1
+
+    def noteon(self, channel: int, note: int, velocity: int):
+        self.record(NOTE_ON, channel, note, velocity)
+
+    def noteoff(self, channel: int, note: int):
+        self.record(NOTE_OFF, channel, note, 0)
+
+    def program_select(self, channel: int, bank: int, preset: int):
+        self.record(PROGRAM_SELECT, channel, bank, preset)
+
+    def all_notes_off(self, channel: int):
+        self.record(ALL_NOTES_OFF, channel, 0, 0)
+
+    def recorded(self) -> np.ndarray:
+        """Returns the events that were recorded so far."""
+        return self.events[: self.size]
+
+    def clear(self):
+        self.size = 0
+        self.dropped = 0
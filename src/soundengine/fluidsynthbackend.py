@@ -0,0 +1,73 @@
+import fluidsynth
+import numpy as np
+
+from src.config import Configs
+from src.soundengine.backend import SynthBackend
+
+
+class FluidSynthBackend(SynthBackend):
+    """A synth that plays sounds with FluidSynth.
+
+    Parameters
+    ----------
+    configs : Configs
+        The configuration of the application.
+    realtime : bool, optional
+        Whether to play on the configured audio driver.
+        If not, no driver is started and the audio is pulled with get_samples.
+    """
+
+    def __init__(self, configs: Configs, realtime: bool = True):
+        self.fs = fluidsynth.Synth(samplerate=configs.sample_rate, channels=128)
+
+        self.fs.setting("synth.sample-rate", configs.sample_rate)
+        self.fs.setting("synth.reverb.active", 1)
+        self.fs.setting("synth.chorus.active", 1)
+
+        if realtime:
+            if configs.audio_driver == "jack":
+                self.fs.setting("audio.jack.autoconnect", 1)
+
+            print(f"Audio Driver: {configs.audio_driver}")
+            print(f"MIDI Driver: {configs.midi_driver}")
+
+            self.fs.start(
+                driver=configs.audio_driver, midi_driver=configs.midi_driver, device=0
+            )
+
+        self.fs.setting("synth.gain", 0.67)
+
+        self.fs.set_reverb(0.26, 0.62, 0.86, 1)
+        self.fs.set_chorus(22, 0.23, 1, 6.8, 0)
+
+        self.sfid = self.fs.sfload(configs.soundfont_path)
+
+    def noteon(self, channel: int, note: int, velocity: int):
+        self.fs.noteon(channel, note, velocity)
+
+    def noteoff(self, channel: int, note: int):
+        self.fs.noteoff(channel, note)
+
+    def program_select(self, channel: int, bank: int, preset: int):
+        self.fs.program_select(channel, self.sfid, bank, preset)
+
+    def all_notes_off(self, channel: int):
+        self.fs.all_notes_off(channel)
+
+    def get_samples(self, frames: int) -> np.ndarray:
+        """Renders audio from the synth, when it is not started on a driver.
+
+        Parameters
+        ----------
+        frames : int
+            The number of frames to render.
+
+        Returns
+        -------
+        np.ndarray
+            Interleaved stereo 16-bit samples, two per frame.
+        """
+        return self.fs.get_samples(frames)
+
+    def delete(self):
+        self.fs.delete()
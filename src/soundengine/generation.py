@@ -0,0 +1,95 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from multiprocessing import Pipe
+from threading import Lock
+
+from src.clock import Clock
+from src.commands import MonsterCommand
+from src.monsters import LookaheadEntry, Monster
+
+
+class GenerationPool:
+    """Generates the sounds of monsters on worker threads,
+    so that the timing loop of the sound engine never waits for them.
+
+    A monster has at most one generation in flight at a time.
+    While it is in flight the worker owns the plugins and the timing of the
+    monster, so commands that change them are parked and executed, in
+    order, once the generated sounds are collected. The lookahead buffer
+    is only touched by the timing loop.
+
+    Attributes
+    ----------
+    jobs : dict[int, tuple[Monster, Future]]
+        The generations in flight, by monster ID.
+    parked : dict[int, list[MonsterCommand]]
+        The commands waiting for the generation of a monster to finish.
+    """
+
+    def __init__(self, workers: int):
+        self.executor = ThreadPoolExecutor(workers, thread_name_prefix="generation")
+        self.jobs: dict[int, tuple[Monster, Future]] = {}
+        self.parked: dict[int, list[MonsterCommand]] = {}
+
+        # Finished generations write to this pipe,
+        # so the engine can wake up for them while waiting for events
+        self.reader, self.writer = Pipe(duplex=False)
+        self.writer_lock = Lock()
+
+    def busy(self, monster_id: int) -> bool:
+        """Returns whether commands for a monster have to be parked."""
+        return monster_id in self.jobs or monster_id in self.parked
+
+    def park(self, command: MonsterCommand):
+        self.parked.setdefault(command.id, []).append(command)
+
+    def submit(
+        self, monster_id: int, monster: Monster, clock: Clock, until_beat: float
+    ):
+        """Starts generating the sounds of a monster until a beat,
+        unless a generation for it is already in flight."""
+        if monster_id in self.jobs:
+            return
+
+        future = self.executor.submit(monster.generate_sounds, clock, until_beat)
+        future.add_done_callback(self.notify)
+        self.jobs[monster_id] = (monster, future)
+
+    def notify(self, _: Future):
+        with self.writer_lock:
+            self.writer.send_bytes(b"")
+
+    def collect(
+        self,
+    ) -> list[tuple[int, Monster, list[LookaheadEntry], list[MonsterCommand]]]:
+        """Takes the generations that finished, without waiting for the others.
+
+        Returns
+        -------
+        list[tuple[int, Monster, list[LookaheadEntry], list[MonsterCommand]]]
+            The ID of each monster, the monster the sounds were generated for,
+            the sounds, and the commands that were parked for it.
+        """
+        while self.reader.poll():
+            self.reader.recv_bytes()
+
+        finished = []
+        for monster_id, (monster, future) in list(self.jobs.items()):
+            if not future.done():
+                continue
+
+            del self.jobs[monster_id]
+            finished.append(
+                (
+                    monster_id,
+                    monster,
+                    future.result(),
+                    self.parked.pop(monster_id, []),
+                )
+            )
+
+        return finished
+
+    def shutdown(self):
+        self.executor.shutdown(cancel_futures=True)
+        self.reader.close()
+        self.writer.close()
@@ -0,0 +1,233 @@
+from array import array
+
+# Values are kept with SUB_BUCKET_BITS significant bits,
+# so every bucket is within 1/64 of the values it holds
+SUB_BUCKET_BITS = 7
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+HALF_BUCKETS = SUB_BUCKETS // 2
+
+# Latencies are recorded in microseconds, up to about 16 seconds
+MAX_VALUE = (1 << 24) - 1
+
+
+def bucket_index(value: int) -> int:
+    """Returns the bucket of a value.
+
+    Values below ``SUB_BUCKETS`` have a bucket each. Above that, every power
+    of two is split into ``HALF_BUCKETS`` buckets of the same width.
+    """
+    if value < SUB_BUCKETS:
+        return value
+
+    shift = value.bit_length() - SUB_BUCKET_BITS
+    return SUB_BUCKETS + (shift - 1) * HALF_BUCKETS + (value >> shift) - HALF_BUCKETS
+
+
+def bucket_range(index: int) -> tuple[int, int]:
+    """Returns the lowest and highest value that fall into a bucket."""
+    if index < SUB_BUCKETS:
+        return (index, index)
+
+    shift, offset = divmod(index - SUB_BUCKETS, HALF_BUCKETS)
+    shift += 1
+    top = HALF_BUCKETS + offset
+    return (top << shift, ((top + 1) << shift) - 1)
+
+
+class LatencyHistogram:
+    """A histogram of latencies, in the style of HdrHistogram.
+
+    Buckets grow with the values, so the relative precision is the same for
+    short and long latencies, and the histogram has a fixed size however
+    many values are recorded.
+
+    Attributes
+    ----------
+    counts : array
+        The number of values in each bucket.
+    total : int
+        The number of values recorded.
+    max : int
+        The largest value recorded, in microseconds.
+    """
+
+    def __init__(self):
+        self.counts = array("q", bytes(8 * (bucket_index(MAX_VALUE) + 1)))
+        self.total = 0
+        self.max = 0
+
+    def record(self, value: int):
+        """Records a latency, in microseconds.
+
+        Values outside of the range of the histogram are clamped to it.
+        """
+        value = min(max(value, 0), MAX_VALUE)
+        self.counts[bucket_index(value)] += 1
+        self.total += 1
+        if value > self.max:
+            self.max = value
+
+    def add(self, other: "LatencyHistogram"):
+        """Adds the values recorded in another histogram to this one."""
+        for index, count in enumerate(other.counts):
+            if count:
+                self.counts[index] += count
+
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, percentile: float) -> int:
+        """Returns the value below which a percentage of the values fall,
+        to the precision of the buckets.
+
+        Parameters
+        ----------
+        percentile : float
+            The percentage, from 0 to 100.
+        """
+        if not self.total:
+            return 0
+
+        rank = max(1, round(percentile / 100 * self.total))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bucket_range(index)[1], self.max)
+
+        return self.max
+
+    def count_above(self, threshold: int) -> int:
+        """Returns how many values are above a threshold,
+        to the precision of the buckets.
+
+        The values in the bucket of the threshold are counted when the
+        bucket goes above it, so no value above the threshold is missed,
+        but values up to a bucket width below it may be counted.
+        """
+        first = bucket_index(min(max(threshold, 0), MAX_VALUE))
+        if bucket_range(first)[1] <= threshold:
+            first += 1
+
+        return sum(self.counts[first:])
+
+    def stats(self, threshold: int) -> dict[str, float]:
+        """Returns the number of values, the p50, p99 and max value
+        in milliseconds, and how many values are above a threshold
+        given in microseconds."""
+        return {
+            "notes": self.total,
+            "p50": self.percentile(50) / 1000,
+            "p99": self.percentile(99) / 1000,
+            "max": self.max / 1000,
+            "late": self.count_above(threshold),
+        }
+
+
+class LatencyStats:
+    """How late the notes of each channel are played.
+
+    Can be set as the onset recorder of the sound engine.
+
+    Attributes
+    ----------
+    histograms : dict[int, LatencyHistogram]
+        The lateness of the notes, by channel.
+    """
+
+    def __init__(self):
+        self.histograms: dict[int, LatencyHistogram] = {}
+
+    def record(self, channel: int, lateness: float):
+        """Records how late a note was played, in seconds."""
+        histogram = self.histograms.get(channel)
+        if histogram is None:
+            histogram = self.histograms[channel] = LatencyHistogram()
+
+        histogram.record(int(lateness * 1_000_000))
+
+    def total(self) -> LatencyHistogram:
+        """Returns the lateness of the notes of every channel together."""
+        total = LatencyHistogram()
+        for histogram in self.histograms.values():
+            total.add(histogram)
+
+        return total
+
+    def summary(self, threshold: float) -> dict[int, dict[str, float]]:
+        """Returns the statistics of each channel.
+
+        Parameters
+        ----------
+        threshold : float
+            How late, in milliseconds, a note has to be to count as late.
+
+        Returns
+        -------
+        dict[int, dict[str, float]]
+            The number of notes, the p50, p99 and max lateness in
+            milliseconds, and the number of late notes, by channel.
+        """
+        return {
+            channel: histogram.stats(int(threshold * 1000))
+            for channel, histogram in sorted(self.histograms.items())
+        }
+
+    def report(self, threshold: float) -> "LatencyReport":
+        """Returns the statistics of each channel and of all of them.
+
+        Parameters
+        ----------
+        threshold : float
+            How late, in milliseconds, a note has to be to count as late.
+        """
+        return LatencyReport(
+            threshold,
+            self.summary(threshold),
+            self.total().stats(int(threshold * 1000)),
+        )
+
+
+class LatencyReport:
+    """How late the notes of each channel were played, at some point.
+
+    Only holds numbers, so it can be sent back from the sound engine
+    process to whoever asked for it.
+
+    Attributes
+    ----------
+    threshold : float
+        How late, in milliseconds, a note has to be to count as late.
+    channels : dict[int, dict[str, float]]
+        The number of notes, the p50, p99 and max lateness in milliseconds,
+        and the number of late notes, by channel.
+    total : dict[str, float]
+        The same statistics, for the notes of every channel together.
+    """
+
+    def __init__(
+        self,
+        threshold: float,
+        channels: dict[int, dict[str, float]],
+        total: dict[str, float],
+    ):
+        self.threshold = threshold
+        self.channels = channels
+        self.total = total
+
+    def text(self) -> str:
+        """Returns the statistics as lines of text."""
+        lines = [f"Note lateness (ms), late above {self.threshold:g} ms:"]
+
+        rows = [
+            (f"channel {channel}", stats) for channel, stats in self.channels.items()
+        ]
+        rows.append(("all channels", self.total))
+        for name, stats in rows:
+            lines.append(
+                f"  {name}: {stats['notes']} notes, "
+                f"p50 {stats['p50']:.3f}, p99 {stats['p99']:.3f}, "
+                f"max {stats['max']:.3f}, {stats['late']} late"
+            )
+
+        return "\n".join(lines)
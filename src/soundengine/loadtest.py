@@ -0,0 +1,197 @@
+"""Runs the sound engine on many copies of a scene, without audio or a GUI.
+
+The engine loop runs in real time against a synth that plays nothing,
+for a number of beats, and reports how many notes and loop iterations
+it got through per second and how late the notes were played.
+
+Run with ``python -m src.soundengine.loadtest scene.json --copies 1000``.
+"""
+
+import os
+from argparse import ArgumentParser
+from array import array
+from contextlib import redirect_stdout
+from time import perf_counter
+
+import numpy as np
+
+from src.clock import Clock
+from src.config import Configs
+from src.generative.indispensability import precompute_pulse_weights
+from src.soundengine.backend import NullBackend, RecordingBackend, SynthBackend
+from src.soundengine.generation import GenerationPool
+from src.soundengine.scene import Scene
+from src.soundengine.soundengine import SoundEngine
+
+PERCENTILES = [50, 90, 99, 99.9]
+
+
+class OnsetRecorder:
+    """Keeps the lateness of every note the engine plays.
+
+    Attributes
+    ----------
+    lateness : array
+        How late each note was played, in seconds, in the order they were played.
+        The notes of every channel are kept together.
+    """
+
+    def __init__(self):
+        self.lateness = array("d")
+
+    def record(self, _channel: int, lateness: float):
+        self.lateness.append(lateness)
+
+
+class LoadTestResult:
+    """The numbers measured by a load test.
+
+    Attributes
+    ----------
+    monsters : int
+        The number of monsters in the engine.
+    seconds : float
+        How long the engine loop ran for.
+    iterations : int
+        The number of iterations of the engine loop.
+    lateness : np.ndarray
+        How late each note was played, in milliseconds.
+    """
+
+    def __init__(
+        self, monsters: int, seconds: float, iterations: int, lateness: np.ndarray
+    ):
+        self.monsters = monsters
+        self.seconds = seconds
+        self.iterations = iterations
+        self.lateness = lateness
+
+    @property
+    def notes(self) -> int:
+        return len(self.lateness)
+
+    def percentiles(self) -> list[float]:
+        """Returns the lateness at each of ``PERCENTILES``, in milliseconds."""
+        if not self.notes:
+            return [0.0] * len(PERCENTILES)
+
+        return np.percentile(self.lateness, PERCENTILES).tolist()
+
+    def summary(self) -> str:
+        lines = [
+            f"{self.monsters} monsters for {self.seconds:.2f} s",
+            f"{self.notes / self.seconds:.0f} notes/s, "
+            f"{self.iterations / self.seconds:.0f} iterations/s",
+        ]
+
+        lateness = ", ".join(
+            f"p{percentile:g} {value:.3f}"
+            for percentile, value in zip(PERCENTILES, self.percentiles())
+        )
+        maximum = self.lateness.max() if self.notes else 0.0
+        lines.append(f"lateness (ms): {lateness}, max {maximum:.3f}")
+
+        return "\n".join(lines)
+
+
+def create_backend(name: str) -> SynthBackend:
+    if name == "recording":
+        return RecordingBackend()
+
+    return NullBackend()
+
+
+def run(
+    scene: Scene,
+    configs: Configs,
+    copies: int,
+    beats: float,
+    backend: str = "null",
+) -> LoadTestResult:
+    """Plays copies of a scene in real time until the clock reaches a beat.
+
+    The engine is set up the way ``soundengine.start`` sets it up,
+    with the engine mode, lookahead and generation workers of the configs.
+
+    Parameters
+    ----------
+    scene : Scene
+        The scene to play.
+    configs : Configs
+        The configuration of the engine.
+    copies : int
+        How many copies of the monsters of the scene are played at once.
+    beats : float
+        How many beats to play.
+    backend : str, optional
+        The synth to play on, either ``null`` or ``recording``.
+    """
+    precompute_pulse_weights((configs.metric_level,))
+
+    clock = Clock(scene.bpm, *scene.signature, metric_level=configs.metric_level)
+    pool = None
+    if configs.generation_workers > 0:
+        pool = GenerationPool(configs.generation_workers)
+
+    engine = SoundEngine(
+        create_backend(backend),
+        clock,
+        lookahead_beats=configs.lookahead_beats,
+        pool=pool,
+    )
+    engine.select_programs()
+
+    # Every monster created is printed, which is too much for thousands of them
+    with open(os.devnull, "w", encoding="utf-8") as devnull, redirect_stdout(devnull):
+        for command in scene.monster_commands(copies):
+            engine.execute_monster_command(command, 0.0)
+
+    onsets = OnsetRecorder()
+    engine.onsets = onsets
+
+    event_mode = configs.engine_mode == "event"
+    timing_slack = configs.timing_slack / 1000
+
+    # Creating the monsters takes a while, and the scene starts after it
+    clock.restart()
+    iterations = 0
+    start = perf_counter()
+    while clock.current_beat < beats:
+        current_beat = engine.generate()
+        engine.release(current_beat)
+        engine.trigger(current_beat)
+        engine.refill()
+        iterations += 1
+
+        if event_mode:
+            engine.wait_for_next_event(timing_slack)
+
+    seconds = perf_counter() - start
+    engine.shutdown()
+
+    return LoadTestResult(
+        len(engine.monsters),
+        seconds,
+        iterations,
+        np.frombuffer(onsets.lateness, dtype=np.float64) * 1000,
+    )
+
+
+def main():
+    parser = ArgumentParser(description="Load test the sound engine with a scene.")
+    parser.add_argument("scene", help="path to the scene JSON file")
+    parser.add_argument(
+        "--copies", type=int, default=1000, help="copies of the scene to play"
+    )
+    parser.add_argument("--beats", type=float, default=16, help="beats to play")
+    parser.add_argument("--backend", choices=["null", "recording"], default="null")
+    args = parser.parse_args()
+
+    result = run(
+        Scene.load(args.scene), Configs(), args.copies, args.beats, args.backend
+    )
+    print(result.summary())
+
+
+if __name__ == "__main__":
+    main()
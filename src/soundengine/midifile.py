@@ -0,0 +1,239 @@
+import struct
+from typing import BinaryIO
+
+from src.clock import Clock
+from src.soundengine.backend import SynthBackend
+
+END_OF_TRACK = b"\xff\x2f\x00"
+
+# Soundfonts keep their drum kits in bank 128, while General MIDI plays
+# drum kits on channel 10, selected by program change alone
+PERCUSSION_BANK = 128
+PERCUSSION_CHANNEL = 9
+
+
+def variable_length(value: int) -> bytes:
+    """Encodes a number as a MIDI variable length quantity.
+
+    Parameters
+    ----------
+    value : int
+        The number to encode.
+
+    Returns
+    -------
+    bytes
+        Seven bits per byte, most significant first,
+        with the high bit set on every byte but the last.
+    """
+    encoded = bytearray([value & 0x7F])
+    value >>= 7
+    while value:
+        encoded.append((value & 0x7F) | 0x80)
+        value >>= 7
+
+    encoded.reverse()
+    return bytes(encoded)
+
+
+class MidiTrack:
+    """A track chunk of a MIDI file that is written to the file as events
+    arrive.
+
+    Events are encoded into a small buffer, which is appended to the file
+    once it grows past ``flush_size`` bytes, so a track can grow for hours
+    without growing memory. The length of the chunk is updated on every
+    flush, so the file can be read up to the last flush even if the track
+    is never closed.
+    """
+
+    def __init__(self, file: BinaryIO, flush_size: int):
+        self.file = file
+        self.flush_size = flush_size
+        self.buffer = bytearray()
+        self.last_tick = 0
+
+        self.file.write(b"MTrk")
+        self.length_offset = self.file.tell()
+        self.length = 0
+        self.file.write(struct.pack(">I", self.length))
+
+    def add(self, tick: int, event: bytes):
+        delta = max(tick - self.last_tick, 0)
+        self.last_tick = max(tick, self.last_tick)
+
+        self.buffer += variable_length(delta)
+        self.buffer += event
+
+        if len(self.buffer) >= self.flush_size:
+            self.flush()
+
+    def flush(self):
+        self.file.write(self.buffer)
+        self.length += len(self.buffer)
+        self.buffer.clear()
+
+        end = self.file.tell()
+        self.file.seek(self.length_offset)
+        self.file.write(struct.pack(">I", self.length))
+        self.file.seek(end)
+        self.file.flush()
+
+    def close(self):
+        """Ends the track, and writes what is left of it."""
+        self.add(self.last_tick, END_OF_TRACK)
+        self.flush()
+
+
+class MidiFileWriter:
+    """Writes a Standard MIDI File as the sound engine plays.
+
+    The file has a single track, with the tempo and time signature changes
+    and the events of every channel, which is written to the file while
+    the engine plays. If the application is killed, the file still holds
+    the events up to the last flush of the track.
+
+    Channels playing a drum kit of the percussion bank are written to the
+    General MIDI percussion channel, which only plays one drum kit at a
+    time. The first drum kit selected is kept for all of them, and the
+    program changes of the other drum kits are left out.
+
+    Attributes
+    ----------
+    path : str
+        The path of the MIDI file.
+    ticks_per_beat : int
+        The resolution of the file, in ticks per quarter note.
+    """
+
+    def __init__(self, path: str, ticks_per_beat: int = 480, flush_size: int = 65536):
+        self.path = path
+        self.ticks_per_beat = ticks_per_beat
+
+        self.file = open(path, "wb")
+        self.file.write(b"MThd")
+        self.file.write(struct.pack(">IHHH", 6, 0, 1, ticks_per_beat))
+        self.track = MidiTrack(self.file, flush_size)
+
+        # Only channels that were played are turned off
+        self.channels: set[int] = set()
+        self.percussion: set[int] = set()
+        self.percussion_preset: int | None = None
+        self.tempo: int | None = None
+        self.time_signature: tuple[int, int] | None = None
+
+    def to_ticks(self, beat: float) -> int:
+        return round(beat * self.ticks_per_beat)
+
+    def add(self, beat: float, channel: int, event: bytes):
+        self.channels.add(channel)
+        self.track.add(self.to_ticks(beat), event)
+
+    def midi_channel(self, channel: int) -> int:
+        if channel in self.percussion:
+            return PERCUSSION_CHANNEL
+
+        return channel & 0x0F
+
+    def note_on(self, beat: float, channel: int, note: int, velocity: int):
+        # A velocity of 0 would be read as a note off
+        event = bytes(
+            [
+                0x90 | self.midi_channel(channel),
+                min(max(note, 0), 127),
+                min(max(velocity, 1), 127),
+            ]
+        )
+        self.add(beat, channel, event)
+
+    def note_off(self, beat: float, channel: int, note: int):
+        event = bytes([0x80 | self.midi_channel(channel), min(max(note, 0), 127), 0])
+        self.add(beat, channel, event)
+
+    def program_change(self, beat: float, channel: int, bank: int, preset: int):
+        if bank == PERCUSSION_BANK:
+            self.percussion.add(channel)
+            # Another drum kit would replace the one already playing
+            if self.percussion_preset is not None:
+                return
+            self.percussion_preset = preset
+        else:
+            self.percussion.discard(channel)
+            event = bytes([0xB0 | self.midi_channel(channel), 0, min(bank, 127)])
+            self.add(beat, channel, event)
+
+        event = bytes([0xC0 | self.midi_channel(channel), preset & 0x7F])
+        self.add(beat, channel, event)
+
+    def all_notes_off(self, beat: float, channel: int):
+        if channel in self.channels:
+            event = bytes([0xB0 | self.midi_channel(channel), 123, 0])
+            self.track.add(self.to_ticks(beat), event)
+
+    def set_tempo(self, beat: float, bpm: float):
+        tempo = round(60_000_000 / bpm)
+        if tempo == self.tempo:
+            return
+
+        self.tempo = tempo
+        event = b"\xff\x51\x03" + tempo.to_bytes(3, "big")
+        self.track.add(self.to_ticks(beat), event)
+
+    def set_time_signature(self, beat: float, nominator: int, denominator: int):
+        # MIDI files store the denominator as a power of two
+        if denominator < 1 or denominator & (denominator - 1):
+            raise ValueError(f"Unsupported time signature denominator {denominator}")
+
+        if (nominator, denominator) == self.time_signature:
+            return
+
+        self.time_signature = (nominator, denominator)
+        event = b"\xff\x58\x04" + bytes(
+            [nominator, denominator.bit_length() - 1, 24, 8]
+        )
+        self.track.add(self.to_ticks(beat), event)
+
+    def close(self):
+        """Ends the track, and closes the MIDI file."""
+        self.track.close()
+        self.file.close()
+
+
+class MidiCaptureBackend(SynthBackend):
+    """A synth that writes every event to a MIDI file,
+    and passes it on to another synth.
+
+    Events are placed at the current beat of the clock.
+    """
+
+    def __init__(self, synth: SynthBackend, writer: MidiFileWriter, clock: Clock):
+        self.synth = synth
+        self.writer = writer
+        self.clock = clock
+
+    def noteon(self, channel: int, note: int, velocity: int):
+        self.synth.noteon(channel, note, velocity)
+        self.writer.note_on(self.clock.current_beat, channel, note, velocity)
+
+    def noteoff(self, channel: int, note: int):
+        self.synth.noteoff(channel, note)
+        self.writer.note_off(self.clock.current_beat, channel, note)
+
+    def program_select(self, channel: int, bank: int, preset: int):
+        self.synth.program_select(channel, bank, preset)
+        self.writer.program_change(self.clock.current_beat, channel, bank, preset)
+
+    def all_notes_off(self, channel: int):
+        self.synth.all_notes_off(channel)
+        self.writer.all_notes_off(self.clock.current_beat, channel)
+
+    def clock_changed(self, clock: Clock):
+        self.synth.clock_changed(clock)
+        self.writer.set_tempo(clock.current_beat, clock.bpm)
+        self.writer.set_time_signature(
+            clock.current_beat, clock.nominator, clock.denominator
+        )
+
+    def delete(self):
+        self.synth.delete()
+        self.writer.close()
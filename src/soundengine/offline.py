@@ -0,0 +1,155 @@
+"""Renders a scene to a WAV file, faster than realtime.
+
+The sound engine is driven by a virtual clock that counts rendered samples,
+and the audio is pulled from FluidSynth without starting an audio driver.
+
+Run with ``python -m src.soundengine.offline scene.json output.wav --beats 64``.
+"""
+
+import wave
+from argparse import ArgumentParser
+from math import ceil
+
+from src.clock import Clock
+from src.config import Configs
+from src.soundengine.fluidsynthbackend import FluidSynthBackend
+from src.soundengine.midifile import MidiCaptureBackend, MidiFileWriter
+from src.soundengine.scene import Scene
+from src.soundengine.soundengine import SoundEngine
+
+
+class OfflineRenderer:
+    """Renders the sound engine into audio blocks.
+
+    Audio is rendered in blocks of at most ``block_size`` frames,
+    and blocks are split at every note on and note off,
+    so that each event starts at its exact sample.
+
+    Attributes
+    ----------
+    sample_rate : float
+        The sample rate of the rendered audio.
+    frame : int
+        The number of frames rendered so far.
+    """
+
+    def __init__(
+        self,
+        scene: Scene,
+        configs: Configs,
+        block_size: int = 1024,
+        lookahead_beats: float = 0.0,
+        midi_path: str | None = None,
+    ):
+        self.sample_rate = configs.sample_rate
+        self.block_size = block_size
+        self.frame = 0
+
+        self.synth = FluidSynthBackend(configs, realtime=False)
+        clock = Clock(
+            scene.bpm,
+            *scene.signature,
+            time=self.current_time,
+            metric_level=configs.metric_level,
+        )
+
+        synth = self.synth
+        if midi_path:
+            synth = MidiCaptureBackend(synth, MidiFileWriter(midi_path), clock)
+
+        self.engine = SoundEngine(synth, clock, lookahead_beats=lookahead_beats)
+        self.engine.select_programs()
+
+        for command in scene.monster_commands():
+            self.engine.execute_monster_command(command, clock.tick())
+
+    def current_time(self) -> float:
+        return self.frame / self.sample_rate
+
+    def frames_until(self, beat: float, current_beat: float) -> int:
+        seconds = self.engine.clock.beats_to_seconds(beat - current_beat)
+        # The small tolerance keeps rounding errors from adding a frame
+        return max(1, ceil(seconds * self.sample_rate - 1e-6))
+
+    def render(self, total_frames: int):
+        """Renders audio until ``total_frames`` frames have been rendered.
+
+        Yields
+        ------
+        np.ndarray
+            Blocks of interleaved stereo 16-bit samples.
+        """
+        engine = self.engine
+        event_beat = None
+        while self.frame < total_frames:
+            current_beat = engine.generate()
+            if event_beat is not None:
+                # The block was cut at an event, so make sure rounding errors
+                # do not leave the clock just before it
+                current_beat = engine.clock.catch_up(event_beat)
+
+            engine.release(current_beat)
+            engine.trigger(current_beat)
+            engine.refill()
+
+            frames = min(self.block_size, total_frames - self.frame)
+            event_beat = engine.next_event_beat()
+            if event_beat is not None:
+                event_frames = self.frames_until(event_beat, current_beat)
+                if event_frames <= frames:
+                    frames = event_frames
+                else:
+                    event_beat = None
+
+            yield self.synth.get_samples(frames)
+            self.frame += frames
+
+    def render_to_wav(self, path: str, beats: float):
+        """Renders a number of beats of the scene to a WAV file.
+
+        Blocks are written as they are rendered,
+        so memory use does not depend on the length of the scene.
+
+        Parameters
+        ----------
+        path : str
+            The path of the WAV file.
+        beats : float
+            How many beats to render.
+        """
+        seconds = self.engine.clock.beats_to_seconds(beats)
+        total_frames = int(seconds * self.sample_rate)
+
+        with wave.open(path, "wb") as wav:
+            wav.setnchannels(2)
+            wav.setsampwidth(2)
+            wav.setframerate(int(self.sample_rate))
+
+            for block in self.render(total_frames):
+                wav.writeframes(block.tobytes())
+
+        self.engine.shutdown()
+
+
+def main():
+    parser = ArgumentParser(description="Render a scene to a WAV file.")
+    parser.add_argument("scene", help="path to the scene JSON file")
+    parser.add_argument("output", help="path of the WAV file to write")
+    parser.add_argument("--beats", type=float, default=64, help="beats to render")
+    parser.add_argument("--block-size", type=int, default=1024)
+    parser.add_argument("--midi", help="also write the notes to this MIDI file")
+    args = parser.parse_args()
+
+    configs = Configs()
+    renderer = OfflineRenderer(
+        Scene.load(args.scene),
+        configs,
+        args.block_size,
+        configs.lookahead_beats,
+        args.midi,
+    )
+    renderer.render_to_wav(args.output, args.beats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+import json
+from typing import Type
+
+from src.commands import (
+    CreateMonsterCommand,
+    MonsterCommand,
+    UpdateMonsterMutedCommand,
+    UpdateMonsterPluginParameterCommand,
+)
+from src.monsters import Monster
+from src.monsters.euclideanmonster import RattleSnare, ThumpFoot
+from src.monsters.fractalmonster import (
+    Boris,
+    DarkEcho,
+    EtherealEcho,
+    FusionCore,
+    HummingVenus,
+    SonicScale,
+)
+
+MONSTER_TYPES: dict[str, Type[Monster]] = {
+    monster_type.__name__: monster_type
+    for monster_type in [
+        EtherealEcho,
+        DarkEcho,
+        Boris,
+        FusionCore,
+        HummingVenus,
+        SonicScale,
+        ThumpFoot,
+        RattleSnare,
+    ]
+}
+
+
+class SceneMonster:
+    """A monster placed in a scene.
+
+    Attributes
+    ----------
+    monster_type : Type[Monster]
+        The type of the monster.
+    position : tuple[float, float]
+        The position of the monster, with coordinates ranging from 0 to 1.
+    muted : bool
+        Whether the monster is muted or not.
+    parameters : dict[str, float]
+        The values of the plugin parameters of the monster, by parameter name.
+    """
+
+    def __init__(
+        self,
+        monster_type: Type[Monster],
+        position: tuple[float, float],
+        muted: bool = False,
+        parameters: dict[str, float] | None = None,
+    ):
+        self.monster_type = monster_type
+        self.position = position
+        self.muted = muted
+        self.parameters = parameters or {}
+
+    def commands(self, id: int) -> list[MonsterCommand]:
+        """Returns the commands that place this monster in the sound engine.
+
+        Parameters
+        ----------
+        id : int
+            The ID to give the monster.
+        """
+        commands = [CreateMonsterCommand(id, self.monster_type, self.position)]
+
+        parameter_names = []
+        if self.parameters:
+            parameter_names = [
+                parameter.name
+                for parameter in self.monster_type(self.position).plugin_parameters
+            ]
+        for name, value in self.parameters.items():
+            commands.append(
+                UpdateMonsterPluginParameterCommand(
+                    id, parameter_names.index(name), value
+                )
+            )
+
+        if self.muted:
+            commands.append(UpdateMonsterMutedCommand(id, True))
+
+        return commands
+
+
+class Scene:
+    """A description of the monsters and clock of a session.
+
+    Scenes are stored as JSON, for example::
+
+        {
+            "bpm": 80,
+            "signature": [4, 4],
+            "monsters": [
+                {"type": "EtherealEcho", "position": [0.5, 0.5]},
+                {"type": "ThumpFoot", "position": [0.2, 0.8],
+                 "parameters": {"Recall": 8}, "muted": false}
+            ]
+        }
+
+    Attributes
+    ----------
+    bpm : float
+        The BPM of the clock.
+    signature : tuple[int, int]
+        The time signature of the clock.
+    monsters : list[SceneMonster]
+        The monsters in the scene.
+    """
+
+    def __init__(
+        self,
+        bpm: float = 80,
+        signature: tuple[int, int] = (4, 4),
+        monsters: list[SceneMonster] | None = None,
+    ):
+        self.bpm = bpm
+        self.signature = signature
+        self.monsters = monsters or []
+
+    @classmethod
+    def load(cls, path: str) -> "Scene":
+        with open(path, encoding="utf-8") as file:
+            data = json.load(file)
+
+        monsters = []
+        for monster in data.get("monsters", []):
+            if monster["type"] not in MONSTER_TYPES:
+                raise ValueError(f"Unknown monster type {monster['type']}")
+
+            monsters.append(
+                SceneMonster(
+                    MONSTER_TYPES[monster["type"]],
+                    tuple(monster["position"]),
+                    monster.get("muted", False),
+                    monster.get("parameters"),
+                )
+            )
+
+        return cls(data.get("bpm", 80), tuple(data.get("signature", (4, 4))), monsters)
+
+    def monster_commands(self, copies: int = 1) -> list[MonsterCommand]:
+        """Returns the commands that place the monsters in the sound engine.
+
+        Parameters
+        ----------
+        copies : int, optional
+            How many times each monster is placed.
+            Every copy gets its own ID, following the ones of the previous copy.
+        """
+        commands = []
+        for copy in range(copies):
+            for index, monster in enumerate(self.monsters):
+                commands.extend(monster.commands(copy * len(self.monsters) + index))
+
+        return commands
@@ -0,0 +1,178 @@
+from array import array
+
+
+class ActiveNotePool:
+    """Keeps the notes that are currently playing, ordered by the beat
+    at which they have to be released.
+
+    The notes are stored as a struct of arrays, with one slot per note.
+    Freed slots are reused, and a binary heap of slot indices keyed on the
+    end of each note finds the notes that are due. Once the arrays are large
+    enough for the notes that are held at once, playing and releasing
+    notes does not allocate any objects.
+
+    Attributes
+    ----------
+    channels, notes, velocities : array
+        The MIDI channel, note and velocity of the note in each slot.
+    inits, ends : array
+        The beats at which the note in each slot starts and has to be released.
+    monster_ids : array
+        The ID of the monster that played the note in each slot.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self.capacity = 0
+        self.channels = array("h")
+        self.notes = array("h")
+        self.velocities = array("h")
+        self.inits = array("d")
+        self.ends = array("d")
+        self.monster_ids = array("q")
+        # The order the notes were played in breaks ties between equal ends
+        self.orders = array("q")
+        self.free = array("q")
+        self.heap: list[int] = []
+        self.counter = 0
+
+        self.grow(capacity)
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def grow(self, capacity: int):
+        """Makes room for ``capacity`` notes held at once."""
+        added = capacity - self.capacity
+        for values in (
+            self.channels,
+            self.notes,
+            self.velocities,
+            self.inits,
+            self.ends,
+            self.monster_ids,
+            self.orders,
+        ):
+            values.extend([0] * added)
+
+        # Slots are taken from the end, so lower slots are handed out first
+        self.free.extend(range(capacity - 1, self.capacity - 1, -1))
+        self.capacity = capacity
+
+    def push(
+        self,
+        monster_id: int,
+        channel: int,
+        note: int,
+        velocity: int,
+        init: float,
+        end: float,
+    ) -> int:
+        """Adds a note that has just been played.
+
+        Parameters
+        ----------
+        monster_id : int
+            The ID of the monster that played the note.
+        channel, note, velocity : int
+            The MIDI channel, note and velocity of the note.
+        init, end : float
+            The beats at which the note starts and has to be released.
+
+        Returns
+        -------
+        int
+            The slot of the note.
+        """
+        if not self.free:
+            self.grow(self.capacity * 2)
+
+        index = self.free.pop()
+        self.channels[index] = channel
+        self.notes[index] = note
+        self.velocities[index] = velocity
+        self.inits[index] = init
+        self.ends[index] = end
+        self.monster_ids[index] = monster_id
+        self.orders[index] = self.counter
+        self.counter += 1
+
+        self.heap.append(index)
+        self.sift_up(len(self.heap) - 1)
+        return index
+
+    def peek_end(self) -> float | None:
+        """Returns the beat of the earliest note off, if any."""
+        if not self.heap:
+            return None
+
+        return self.ends[self.heap[0]]
+
+    def pop_due(self, current_beat: float) -> int:
+        """Removes the earliest note, if it has to be released.
+
+        The slot of the note is freed, but its values can still be read
+        until the next note is pushed.
+
+        Parameters
+        ----------
+        current_beat : float
+            The current beat of the clock.
+
+        Returns
+        -------
+        int
+            The slot of the note, or -1 if no note has to be released.
+        """
+        heap = self.heap
+        if not heap or self.ends[heap[0]] > current_beat:
+            return -1
+
+        index = heap[0]
+        last = heap.pop()
+        if heap:
+            heap[0] = last
+            self.sift_down(0)
+
+        self.free.append(index)
+        return index
+
+    def before(self, a: int, b: int) -> bool:
+        """Returns whether the note in slot a is released before the one in b."""
+        ends = self.ends
+        if ends[a] != ends[b]:
+            return ends[a] < ends[b]
+
+        return self.orders[a] < self.orders[b]
+
+    def sift_up(self, position: int):
+        heap = self.heap
+        index = heap[position]
+        while position > 0:
+            parent = (position - 1) >> 1
+            if not self.before(index, heap[parent]):
+                break
+
+            heap[position] = heap[parent]
+            position = parent
+
+        heap[position] = index
+
+    def sift_down(self, position: int):
+        heap = self.heap
+        size = len(heap)
+        index = heap[position]
+        while True:
+            child = 2 * position + 1
+            if child >= size:
+                break
+
+            if child + 1 < size and self.before(heap[child + 1], heap[child]):
+                child += 1
+
+            if not self.before(heap[child], index):
+                break
+
+            heap[position] = heap[child]
+            position = child
+
+        heap[position] = index
@@ -1,107 +1,387 @@
-from multiprocessing import Event, Queue
-
-import fluidsynth
+from multiprocessing import Event, Queue, SimpleQueue
+from multiprocessing.connection import Connection, wait
 
 from src.clock import Clock
-from src.commands import ClockCommand, MonsterCommand
+from src.commands import ClockCommand, EngineCommand, MonsterCommand
+from src.commands.batch import MessageCounter, coalesce
 from src.config import Configs
+from src.generative.euclidean import euclidean_pattern
+from src.generative.indispensability import precompute_pulse_weights
 from src.monsters import Monster
-from src.soundengine.sound import MonsterSoundEvent, Sound
+from src.soundengine.activity import ActivityTable
+from src.soundengine.backend import NullBackend, SynthBackend
+from src.soundengine.generation import GenerationPool
+from src.soundengine.latency import LatencyStats
+from src.soundengine.midifile import MidiCaptureBackend, MidiFileWriter
+from src.soundengine.scheduler import ActiveNotePool
+from src.soundengine.sound import accent
 
+# Upper bound on how long the engine sleeps without checking the stop event
+MAX_WAIT = 0.1
 
-def start(
-    stop_event: Event,
-    monster_command_queue: "Queue[MonsterCommand]",
-    clock_command_queue: "Queue[ClockCommand]",
-    monster_sound_queue: "Queue[MonsterSoundEvent]",
-):
-    configs = Configs()
+# The (bank, preset) of the instrument played by each channel
+PROGRAMS = [
+    (0, 32),
+    (0, 45),
+    (128, 13),
+    (128, 6),
+    (0, 21),
+    (0, 62),
+    (1, 4),
+    (1, 10),
+]
 
-    fs = fluidsynth.Synth(samplerate=configs.sample_rate, channels=128)
 
-    fs.setting("synth.sample-rate", configs.sample_rate)
-    fs.setting("synth.reverb.active", 1)
-    fs.setting("synth.chorus.active", 1)
+class SoundEngine:
+    """Plays the sounds of the monsters on a synth.
 
-    if configs.audio_driver == "jack":
-        fs.setting("audio.jack.autoconnect", 1)
+    Attributes
+    ----------
+    synth : SynthBackend
+        The synth the sounds are played on.
+    clock : Clock
+        The clock that keeps track of the current beat.
+    monsters : dict[int, Monster]
+        The monsters that are playing, indexed by their ID.
+    sounds : ActiveNotePool
+        The notes that are currently being held.
+    lookahead_beats : float
+        How many beats ahead the monsters generate their sounds
+        when the engine is idle.
+    pool : GenerationPool | None
+        The worker threads that generate the sounds of the monsters.
+        If None, the sounds are generated in the engine loop.
+    onsets : OnsetRecorder | None
+        Records how late each note is played, if given.
+        Anything with a ``record(channel, lateness)`` method can be used,
+        with the lateness in seconds.
+    replies : Queue | None
+        Where the results of engine commands are sent back, if given.
+    wakeups : Connection | None
+        Receives a signal every time commands are sent to the engine, so it
+        can wake up for them while waiting for events, if given.
+    """
 
-    print(f"Audio Driver: {configs.audio_driver}")
-    print(f"MIDI Driver: {configs.midi_driver}")
+    def __init__(
+        self,
+        synth: SynthBackend,
+        clock: Clock,
+        activity: ActivityTable | None = None,
+        lookahead_beats: float = 0.0,
+        pool: GenerationPool | None = None,
+    ):
+        self.synth = synth
+        self.clock = clock
+        self.activity = activity
+        self.lookahead_beats = lookahead_beats
+        self.pool = pool
+        self.onsets = None
+        self.replies: "Queue | None" = None
+        self.wakeups: Connection | None = None
+        self.monsters: dict[int, Monster] = {}
+        self.sounds = ActiveNotePool()
+        self.monster_messages = MessageCounter()
+        self.clock_messages = MessageCounter()
 
-    fs.start(driver=configs.audio_driver, midi_driver=configs.midi_driver, device=0)
+        self.synth.clock_changed(self.clock)
 
-    fs.setting("synth.gain", 0.67)
+    def execute_monster_command(self, command: MonsterCommand, current_beat: float):
+        if (
+            self.pool is not None
+            and command.affects_generation
+            and self.pool.busy(command.id)
+        ):
+            self.pool.park(command)
+            return
 
-    fs.set_reverb(0.26, 0.62, 0.86, 1)
-    fs.set_chorus(22, 0.23, 1, 6.8, 0)
+        command.execute(self.monsters)
 
-    sfid = fs.sfload(configs.soundfont_path)
-    fs.program_select(0, sfid, 0, 32)
-    fs.program_select(1, sfid, 0, 45)
-    fs.program_select(2, sfid, 128, 13)
-    fs.program_select(3, sfid, 128, 6)
-    fs.program_select(4, sfid, 0, 21)
-    fs.program_select(5, sfid, 0, 62)
-    fs.program_select(6, sfid, 1, 4)
-    fs.program_select(7, sfid, 1, 10)
+        if command.id in self.monsters:
+            monster = self.monsters[command.id]
+            monster.initialize(current_beat)
 
-    monsters: dict[int, Monster] = {}
-    sounds: list[tuple[int, Sound]] = []
+    def clear_wakeups(self):
+        """Reads the signals sent since the last iteration of the loop.
 
-    # monsters.append(EtherealEcho((0.5, 0.5)))
+        Signals are sent after the commands they are for, so these commands
+        are already waiting in their queues.
+        """
+        if self.wakeups is None:
+            return
 
-    clock = Clock(80, 4, 4)
-    while True:
-        current_beat = clock.tick()
+        while self.wakeups.poll():
+            self.wakeups.recv_bytes()
+
+    def receive_monster_commands(self, queue: SimpleQueue, current_beat: float):
+        """Executes the batches of commands the GUI sent since the last tick.
+
+        Batches that piled up while the engine was busy are merged and
+        coalesced, so only the newest position and parameter values are
+        applied. All of them are executed before any sound is made."""
+        commands = []
+        while not queue.empty():
+            batch = queue.get()
+            self.monster_messages.count(len(batch))
+            commands.extend(batch)
+
+        coalesced = coalesce(commands)
+        self.monster_messages.coalesced += len(commands) - len(coalesced)
+
+        for command in coalesced:
+            self.execute_monster_command(command, current_beat)
+
+    def receive_clock_commands(self, queue: SimpleQueue):
+        commands = []
+        while not queue.empty():
+            batch = queue.get()
+            self.clock_messages.count(len(batch))
+            commands.extend(batch)
+
+        coalesced = coalesce(commands)
+        self.clock_messages.coalesced += len(commands) - len(coalesced)
+
+        for command in coalesced:
+            if isinstance(command, EngineCommand):
+                command.execute(self)
+            else:
+                self.execute_clock_command(command)
+
+    def execute_clock_command(self, command: ClockCommand):
+        old_bpm = self.clock.bpm
+        print(f"Old BPM: {old_bpm}")
+        command.execute(self.clock)
+        print(f"New BPM: {self.clock.bpm}")
+
+        self.synth.clock_changed(self.clock)
+
+    def reply(self, result):
+        """Sends the result of an engine command back, if anyone listens."""
+        if self.replies is not None:
+            self.replies.put(result)
 
-        while not monster_command_queue.empty():
-            command = monster_command_queue.get()
-            command.execute(monsters)
+    def latency_stats(self) -> LatencyStats | None:
+        """Returns the lateness of the notes played so far,
+        if the engine records it."""
+        if isinstance(self.onsets, LatencyStats):
+            return self.onsets
 
-            if command.id in monsters:
-                monster = monsters[command.id]
-                monster.initialize(current_beat)
+        return None
 
-        while not clock_command_queue.empty():
-            command = clock_command_queue.get()
-            old_bpm = clock.bpm
-            print(f"Old BPM: {old_bpm}")
-            command.execute(clock)
-            print(f"New BPM: {clock.bpm}")
+    def generate(self, lookahead_beats: float = 0.0) -> float:
+        """Makes every monster pre-generate its next sounds.
 
-        current_beat = clock.tick()
+        Parameters
+        ----------
+        lookahead_beats : float, optional
+            How many beats past the current beat the monsters generate.
+            By default only the next sound of each monster is generated.
 
-        # TODO: MOVE THIS TO A SEPARATE THREAD, maybe?
-        for monster in monsters.values():
-            monster.generate_next_sound(clock)
+        Returns
+        -------
+        float
+            The current beat of the clock after generating.
+        """
+        current_beat = self.clock.tick()
+
+        if self.pool is not None:
+            return self.generate_in_pool(current_beat, lookahead_beats)
+
+        for monster in self.monsters.values():
+            monster.generate_next_sound(self.clock, lookahead_beats)
 
             # Generate next sound can take some time, so we get the current beat again so it is accurate
-            current_beat = clock.tick()
+            current_beat = self.clock.tick()
+
+        return current_beat
+
+    def generate_in_pool(self, current_beat: float, lookahead_beats: float) -> float:
+        """Adds the sounds the workers finished to the lookahead buffers,
+        and hands the monsters that need more sounds to the workers.
+        Never waits for a worker."""
+        for monster_id, monster, entries, commands in self.pool.collect():
+            # The monster may have been deleted and replaced meanwhile
+            if self.monsters.get(monster_id) is monster:
+                monster.lookahead.extend(entries)
+
+            for command in commands:
+                self.execute_monster_command(command, current_beat)
+
+        until_beat = current_beat + lookahead_beats
+        for monster_id, monster in self.monsters.items():
+            if monster.needs_sounds(until_beat):
+                self.pool.submit(monster_id, monster, self.clock, until_beat)
+
+        return self.clock.tick()
+
+    def refill(self) -> float:
+        """Fills the lookahead buffers of the monsters.
+        Called when the engine has nothing else to do.
+
+        Returns
+        -------
+        float
+            The current beat of the clock after generating.
+        """
+        return self.generate(self.lookahead_beats)
+
+    def release(self, current_beat: float):
+        sounds = self.sounds
+        index = sounds.pop_due(current_beat)
+        while index >= 0:
+            self.synth.noteoff(sounds.channels[index], sounds.notes[index])
+            if self.activity is not None:
+                self.activity.note_off(sounds.monster_ids[index])
+
+            index = sounds.pop_due(current_beat)
+
+    def trigger(self, current_beat: float):
+        sounds = self.sounds
+        for monster_id, monster in self.monsters.items():
+            index = monster.play_sound(current_beat, sounds, monster_id)
+            if index < 0:
+                continue
+
+            channel = sounds.channels[index]
+            velocity = accent(
+                sounds.velocities[index],
+                self.clock.current_bar,
+                self.clock.pulse_weights,
+            )
+            self.synth.noteon(channel, sounds.notes[index], velocity)
+            if self.onsets is not None:
+                lateness = self.clock.now() - sounds.inits[index]
+                self.onsets.record(channel, self.clock.beats_to_seconds(lateness))
+            if self.activity is not None:
+                self.activity.note_on(monster_id)
+
+    def next_event_beat(self) -> float | None:
+        """Returns the beat of the next note on or note off, if any."""
+        next_beat = self.sounds.peek_end()
+
+        for monster in self.monsters.values():
+            sound_beat = monster.next_sound_beat()
+            if sound_beat is not None and (next_beat is None or sound_beat < next_beat):
+                next_beat = sound_beat
 
-        sounds_to_remove: list[tuple[int, Sound]] = []
+        return next_beat
 
-        for sound in sounds:
-            if sound[1].update(fs, current_beat):
-                sounds_to_remove.append(sound)
-                monster_sound_queue.put(MonsterSoundEvent(sound[0], False))
+    def wait_for_next_event(self, timing_slack: float):
+        """Sleeps until the next event is due or a command arrives.
 
-        for sound in sounds_to_remove:
-            sounds.remove(sound)
+        The engine wakes up ``timing_slack`` seconds before the event is due,
+        and the remaining time is spent spinning, so that sleeping does not
+        make notes fire later.
 
-        for monster_id, monster in monsters.items():
-            sound = monster.make_sound(current_beat)
-            if sound is not None:
-                sound.play(fs, clock.current_bar, clock.pulse_weights)
-                sounds.append((monster_id, sound))
-                monster_sound_queue.put(MonsterSoundEvent(monster_id, True))
+        Parameters
+        ----------
+        timing_slack : float
+            How early, in seconds, the engine wakes up before an event.
+        """
+        next_beat = self.next_event_beat()
+        current_beat = self.clock.tick()
+
+        if next_beat is None:
+            timeout = MAX_WAIT
+        else:
+            timeout = self.clock.beats_to_seconds(next_beat - current_beat)
+            timeout = min(timeout - timing_slack, MAX_WAIT)
+
+        if timeout <= 0:
+            return
+
+        readers = []
+        if self.wakeups is not None:
+            readers.append(self.wakeups)
+        if self.pool is not None:
+            readers.append(self.pool.reader)
+
+        wait(readers, timeout)
+
+    def select_programs(self):
+        for channel, (bank, preset) in enumerate(PROGRAMS):
+            self.synth.program_select(channel, bank, preset)
+
+    def shutdown(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+
+        for i in range(128):
+            self.synth.all_notes_off(i)
+
+        self.synth.delete()
+
+
+def create_backend(configs: Configs) -> SynthBackend:
+    if configs.synth_backend == "null":
+        return NullBackend()
+
+    # Imported here so the engine can run without FluidSynth installed
+    from src.soundengine.fluidsynthbackend import FluidSynthBackend
+
+    return FluidSynthBackend(configs)
+
+
+def start(
+    stop_event: Event,
+    monster_command_queue: "SimpleQueue[list[MonsterCommand]]",
+    clock_command_queue: "SimpleQueue[list[ClockCommand | EngineCommand]]",
+    activity_table_name: str,
+    reply_queue: "Queue | None" = None,
+    wakeups: Connection | None = None,
+):
+    configs = Configs()
+
+    # Time signature changes only look up the weights while playing
+    precompute_pulse_weights((configs.metric_level,))
+
+    clock = Clock(80, 4, 4, metric_level=configs.metric_level)
+    synth = create_backend(configs)
+    if configs.midi_export_path:
+        synth = MidiCaptureBackend(
+            synth, MidiFileWriter(configs.midi_export_path), clock
+        )
+
+    activity = ActivityTable(configs.max_monsters, activity_table_name)
+    pool = None
+    if configs.generation_workers > 0:
+        pool = GenerationPool(configs.generation_workers)
+
+    engine = SoundEngine(synth, clock, activity, configs.lookahead_beats, pool)
+    engine.select_programs()
+    engine.replies = reply_queue
+    engine.wakeups = wakeups
+    if configs.latency_stats:
+        engine.onsets = LatencyStats()
+
+    event_mode = configs.engine_mode == "event"
+    timing_slack = configs.timing_slack / 1000
+
+    while True:
+        current_beat = engine.clock.tick()
+
+        engine.clear_wakeups()
+        engine.receive_monster_commands(monster_command_queue, current_beat)
+        engine.receive_clock_commands(clock_command_queue)
+
+        current_beat = engine.generate()
+        engine.release(current_beat)
+        engine.trigger(current_beat)
+
+        # Use the time until the next event to generate ahead
+        engine.refill()
 
         if stop_event.is_set():
             break
 
-    print("Goodbye world!")
+        if event_mode:
+            engine.wait_for_next_event(timing_slack)
 
-    for i in range(128):
-        fs.all_notes_off(i)
+    print("Goodbye world!")
+    print(f"Received monster commands: {engine.monster_messages.summary()}")
+    print(f"Received clock commands: {engine.clock_messages.summary()}")
+    print(f"Euclidean pattern cache: {euclidean_pattern.cache_info()}")
+    if engine.latency_stats() is not None:
+        print(engine.latency_stats().report(configs.lateness_threshold).text())
 
-    fs.delete()
+    engine.shutdown()
+    activity.close()
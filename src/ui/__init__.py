@@ -1,9 +1,9 @@
-from multiprocessing import Queue
 from typing import Type
 
 import pygame
 import pygame_gui
 
+from src.commands.batch import CommandBatcher
 from src.config import Configs
 from src.field import MonsterField
 from src.monsters import Monster
@@ -16,8 +16,8 @@ class UI:
     def __init__(
         self,
         monster_field: MonsterField,
-        clock_command_queue: Queue,
-        monster_command_queue: Queue,
+        clock_command_queue: CommandBatcher,
+        monster_command_queue: CommandBatcher,
         monster_info: dict[Type[Monster], MonsterInfo],
     ) -> None:
         configs = Configs()
@@ -44,6 +44,9 @@ class UI:
             self.manager, monster_field, monster_command_queue, monster_info
         )
 
+        # The image and area of every element drawn on the last frame
+        self.drawn: list[tuple[pygame.Surface, pygame.Rect]] = []
+
     def process_events(self, event: pygame.event.Event):
         self.manager.process_events(event)
         self.bottom_bar.process_events(event)
@@ -53,9 +56,62 @@ class UI:
         self.manager.update(delta_time / 1000)
         self.bottom_bar.update(delta_time)
 
-    def render(self, screen: pygame.Surface):
-        self.manager.draw_ui(screen)
-        self.bottom_bar.render(screen)
+    def dragging(self) -> bool:
+        """Whether a monster is being dragged from the bottom bar."""
+        return self.bottom_bar.draggable_monster is not None
+
+    def changed_rects(self) -> list[pygame.Rect] | None:
+        """Returns the areas of the screen where elements changed
+        since the last call.
+
+        Elements are redrawn by pygame_gui on new images, so an element
+        changed when its image or its area did.
+
+        Returns
+        -------
+        list[pygame.Rect] | None
+            The areas that changed, or None if elements were shown or hidden.
+        """
+        drawn = self.drawn
+        self.drawn = [
+            (blit_data[0], pygame.Rect(blit_data[1]))
+            for blit_data in self.manager.get_sprite_group().visible
+        ]
+        if len(drawn) != len(self.drawn):
+            return None
+
+        rects = []
+        for (old_image, old_rect), (image, rect) in zip(drawn, self.drawn):
+            if image is not old_image or rect != old_rect:
+                rects.append(old_rect)
+                rects.append(rect)
+
+        return rects
+
+    def render(self, screen: pygame.Surface, rects: list[pygame.Rect] | None = None):
+        """Draws the UI.
+
+        Parameters
+        ----------
+        screen : pygame.Surface
+            The surface to draw on.
+        rects : list[pygame.Rect] | None, optional
+            If given, only these areas of the screen are drawn.
+        """
+        if rects is None:
+            self.manager.draw_ui(screen)
+            self.bottom_bar.render(screen)
+            return
+
+        # A monster dragged from the bottom bar always redraws the whole
+        # screen, so only the elements are drawn here
+        sprites = self.manager.get_sprite_group().visible
+        sprite_rects = [blit_data[1] for blit_data in sprites]
+        for rect in rects:
+            screen.set_clip(rect)
+            for index in rect.collidelistall(sprite_rects):
+                screen.blit(*sprites[index])
+        screen.set_clip(None)
 
     def on_monster_right_click(self, monster: Monster, monster_id: int):
         self.side_bar.show(monster, monster_id)
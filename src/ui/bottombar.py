@@ -1,10 +1,10 @@
-from multiprocessing import Queue
 from typing import Type
 
 import pygame
 import pygame_gui
 
 from src.commands import UpdateClockBpmCommand
+from src.commands.batch import CommandBatcher
 from src.config import Configs
 from src.field import MonsterField
 from src.monsters import Monster
@@ -18,7 +18,7 @@ class BottomBar(DraggableMonsterObserver):
         self,
         ui_manager: pygame_gui.UIManager,
         monster_field: MonsterField,
-        clock_command_queue: Queue,
+        clock_command_queue: CommandBatcher,
         monster_info: dict[Type[Monster], MonsterInfo],
     ):
         configs = Configs()
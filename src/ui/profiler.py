@@ -0,0 +1,268 @@
+import csv
+from time import perf_counter
+
+import numpy as np
+import pygame
+
+STAGES = ("events", "update", "field", "ui", "overlay", "flip")
+STAGE_INDEX = {stage: index for index, stage in enumerate(STAGES)}
+
+# How many frames the rolling percentiles are taken over
+WINDOW = 240
+
+# How often the overlay text is rebuilt, in frames
+OVERLAY_INTERVAL = 15
+
+# Frames in a row the lag has to grow for, while it is over two frames,
+# before it is flagged as a spiral of death
+SPIRAL_FRAMES = 10
+
+PERCENTILES = [50, 95, 99]
+
+
+class FrameProfiler:
+    """Times the stages of every frame of the game.
+
+    The stages are processing events, the catch-up updates, rendering the
+    monster field (including clearing the screen), rendering the UI,
+    rebuilding and drawing this overlay, and flipping the display. The
+    times of the last ``WINDOW`` frames are kept for rolling percentiles,
+    shown on an overlay that can be toggled. The overlay is only redrawn
+    where the screen under it was, and when it is rebuilt.
+
+    When the lag the updates have to catch up with grows for
+    ``SPIRAL_FRAMES`` frames in a row, while it is over two frames,
+    updating takes longer than the frames it simulates and the game is
+    in a spiral of death.
+
+    Parameters
+    ----------
+    budget : float
+        The time of a frame, in milliseconds.
+    csv_path : str | None, optional
+        A CSV file to log the timings of every frame to.
+
+    Attributes
+    ----------
+    visible : bool
+        Whether the overlay is drawn.
+    rect : pygame.Rect | None
+        Where the overlay was last drawn, if it is on the screen.
+    spiral : bool
+        Whether the game is in a spiral of death.
+    """
+
+    def __init__(self, budget: float, csv_path: str | None = None):
+        self.budget = budget
+        self.visible = False
+
+        self.times = np.zeros((WINDOW, len(STAGES) + 1))
+        self.frames = 0
+        self.current = [0.0] * len(STAGES)
+        self.stage_start = 0.0
+
+        self.lag = 0.0
+        self.update_steps = 0
+        self.growing = 0
+        self.spiral = False
+
+        self.font: pygame.font.Font | None = None
+        self.overlay: pygame.Surface | None = None
+        self.rect: pygame.Rect | None = None
+
+        self.csv_file = None
+        self.csv_writer = None
+        if csv_path:
+            self.csv_file = open(csv_path, "w", newline="", encoding="utf-8")
+            self.csv_writer = csv.writer(self.csv_file)
+            self.csv_writer.writerow(
+                ["frame"]
+                + [f"{stage}_ms" for stage in STAGES]
+                + ["total_ms", "update_steps", "lag_ms", "spiral"]
+            )
+
+    def toggle(self):
+        self.visible = not self.visible
+        self.overlay = None
+
+    def start_frame(self, lag: float):
+        """Starts timing a frame.
+
+        Parameters
+        ----------
+        lag : float
+            The time the updates of this frame have to catch up with,
+            in milliseconds.
+        """
+        if lag > self.lag and lag >= 2 * self.budget:
+            self.growing += 1
+        else:
+            self.growing = 0
+
+        spiral = self.growing >= SPIRAL_FRAMES
+        if spiral and not self.spiral:
+            print(f"Spiral of death: the lag grew for {self.growing} frames")
+        self.spiral = spiral
+
+        self.lag = lag
+        self.current = [0.0] * len(STAGES)
+        self.stage_start = perf_counter()
+
+    def end_stage(self, stage: str, update_steps: int | None = None):
+        """Ends a stage of the frame, and starts the next one. The times of
+        a stage ended more than once in a frame are added up.
+
+        Parameters
+        ----------
+        stage : str
+            The name of the stage, one of ``STAGES``.
+        update_steps : int | None, optional
+            The number of updates run, when ending the update stage.
+        """
+        now = perf_counter()
+        self.current[STAGE_INDEX[stage]] += (now - self.stage_start) * 1000
+        self.stage_start = now
+
+        if update_steps is not None:
+            self.update_steps = update_steps
+
+    def end_frame(self):
+        total = sum(self.current)
+        row = self.frames % WINDOW
+        self.times[row, : len(STAGES)] = self.current
+        self.times[row, len(STAGES)] = total
+
+        if self.csv_writer is not None:
+            self.csv_writer.writerow(
+                [self.frames]
+                + [f"{time:.3f}" for time in self.current]
+                + [
+                    f"{total:.3f}",
+                    self.update_steps,
+                    f"{self.lag:.3f}",
+                    int(self.spiral),
+                ]
+            )
+
+        self.frames += 1
+
+    def percentiles(self) -> np.ndarray:
+        """Returns the percentiles of the times of each stage, and of the
+        whole frame, over the last frames, in milliseconds.
+
+        Returns
+        -------
+        np.ndarray
+            One row per percentile in ``PERCENTILES``, and one column
+            per stage followed by the total.
+        """
+        times = self.times[: min(self.frames, WINDOW)]
+        if not len(times):
+            return np.zeros((len(PERCENTILES), len(STAGES) + 1))
+
+        return np.percentile(times, PERCENTILES, axis=0)
+
+    def build_overlay(self) -> pygame.Surface:
+        if self.font is None:
+            self.font = pygame.font.Font("resources/fonts/monogram.ttf", 20)
+
+        percentiles = self.percentiles()
+        rows = [["stage", "last"] + [f"p{percentile}" for percentile in PERCENTILES]]
+        # The frame being drawn is not over yet, so the last one is shown
+        last = self.times[(self.frames - 1) % WINDOW]
+        for index, stage in enumerate(STAGES + ("total",)):
+            rows.append(
+                [stage, f"{last[index]:.2f}"]
+                + [f"{value:.2f}" for value in percentiles[:, index]]
+            )
+
+        notes = [f"updates {self.update_steps}, lag {self.lag:.1f} ms"]
+        if self.spiral:
+            notes.append("SPIRAL OF DEATH")
+
+        # The font is not monospaced, so the columns are placed one by one
+        column_widths = [
+            max(self.font.size(row[column])[0] for row in rows) + 12
+            for column in range(len(rows[0]))
+        ]
+        line_height = self.font.get_linesize()
+        width = max([sum(column_widths)] + [self.font.size(note)[0] for note in notes])
+        overlay = pygame.Surface(
+            (width + 16, line_height * (len(rows) + len(notes)) + 16),
+            pygame.SRCALPHA,
+        )
+        overlay.fill((0, 0, 0, 170))
+
+        y = 8
+        for row in rows:
+            x = 8
+            for column, cell in enumerate(row):
+                text = self.font.render(cell, False, "#FFFFFF")
+                # Numbers are aligned to the right of their column
+                offset = (
+                    0 if column == 0 else column_widths[column] - 12 - text.get_width()
+                )
+                overlay.blit(text, (x + offset, y))
+                x += column_widths[column]
+            y += line_height
+
+        for note in notes:
+            color = "#FF5555" if note == "SPIRAL OF DEATH" else "#FFFFFF"
+            overlay.blit(self.font.render(note, False, color), (8, y))
+            y += line_height
+
+        return overlay
+
+    def dirty_rects(self) -> list[pygame.Rect]:
+        """Rebuilds the overlay when it is due, and returns the areas of the
+        screen that change because of it.
+
+        Returns
+        -------
+        list[pygame.Rect]
+            Where the overlay was drawn and where it is drawn next, when it
+            is rebuilt, shown or hidden.
+        """
+        rects = []
+        if not self.visible:
+            if self.rect is not None:
+                rects.append(self.rect)
+                self.rect = None
+            return rects
+
+        if self.overlay is None or self.frames % OVERLAY_INTERVAL == 0:
+            self.overlay = self.build_overlay()
+            if self.rect is not None:
+                rects.append(self.rect)
+            self.rect = self.overlay.get_rect(topleft=(8, 8))
+            rects.append(self.rect)
+
+        return rects
+
+    def render(self, screen: pygame.Surface, rects: list[pygame.Rect] | None = None):
+        """Draws the overlay, if it is visible.
+
+        Parameters
+        ----------
+        screen : pygame.Surface
+            The screen to draw on.
+        rects : list[pygame.Rect] | None, optional
+            The areas of the screen redrawn this frame, or None if the whole
+            screen is. The overlay is only drawn over these areas, as it is
+            translucent and would darken the rest of the screen under it.
+        """
+        if not self.visible or self.overlay is None or self.rect is None:
+            return
+
+        if rects is None:
+            screen.blit(self.overlay, self.rect)
+            return
+
+        for rect in rects:
+            area = rect.clip(self.rect)
+            if area.width and area.height:
+                screen.blit(self.overlay, area, area.move(-self.rect.x, -self.rect.y))
+
+    def close(self):
+        if self.csv_file is not None:
+            self.csv_file.close()
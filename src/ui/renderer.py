@@ -0,0 +1,88 @@
+import pygame
+
+from src.field import MonsterField
+from src.ui import UI
+
+BACKGROUND = "#5BC4A4"
+
+# When more than this fraction of the screen changed,
+# redrawing the whole screen is cheaper than redrawing the changes
+FULL_REDRAW_AREA = 0.5
+
+
+class DirtyRectRenderer:
+    """Decides which areas of the screen are redrawn every frame.
+
+    Only the areas where monsters moved or changed image, where elements
+    of the UI changed, and where the profiler overlay was rebuilt, are
+    redrawn. The whole screen is redrawn
+    on the first frame, when elements of the UI are shown or hidden, when
+    a monster is dragged from the bottom bar, when too much of the screen
+    changed, and after ``invalidate`` is called.
+
+    Parameters
+    ----------
+    size : tuple[int, int]
+        The size of the screen.
+    """
+
+    def __init__(self, size: tuple[int, int]):
+        self.screen_rect = pygame.Rect((0, 0), size)
+        self.full_redraw = True
+
+    def invalidate(self):
+        """Redraws the whole screen on the next frame."""
+        self.full_redraw = True
+
+    def dirty_rects(
+        self,
+        monster_field: MonsterField,
+        ui: UI,
+        overlay_rects: list[pygame.Rect] | None = None,
+    ) -> list[pygame.Rect] | None:
+        """Returns the areas of the screen to redraw this frame.
+
+        Parameters
+        ----------
+        monster_field : MonsterField
+            The monster field, whose changed monsters are redrawn.
+        ui : UI
+            The UI, whose changed elements are redrawn.
+        overlay_rects : list[pygame.Rect] | None, optional
+            Other areas that changed, like where an overlay was drawn.
+
+        Returns
+        -------
+        list[pygame.Rect] | None
+            The areas to redraw, or None if the whole screen is redrawn.
+        """
+        # Both are asked every frame, so they keep track of what was drawn
+        monster_rects = monster_field.dirty_rects()
+        ui_rects = ui.changed_rects()
+        if overlay_rects is None:
+            overlay_rects = []
+
+        full_redraw = self.full_redraw or ui_rects is None or ui.dragging()
+        # The dragged monster is cleared on the frame after it is dropped
+        self.full_redraw = ui.dragging()
+        if full_redraw:
+            return None
+
+        # Overlapping areas are merged, so nothing is drawn twice over itself
+        rects: list[pygame.Rect] = []
+        for rect in monster_rects + ui_rects + overlay_rects:
+            rect = rect.clip(self.screen_rect)
+            if not rect.width or not rect.height:
+                continue
+
+            index = rect.collidelist(rects)
+            while index != -1:
+                rect.union_ip(rects.pop(index))
+                index = rect.collidelist(rects)
+            rects.append(rect)
+
+        area = sum(rect.width * rect.height for rect in rects)
+        if area > FULL_REDRAW_AREA * self.screen_rect.width * self.screen_rect.height:
+            return None
+
+        return rects
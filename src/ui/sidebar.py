@@ -1,4 +1,3 @@
-from asyncio import Queue
 from typing import Type
 
 import pygame
@@ -7,10 +6,10 @@ from pygame_gui.core import IContainerLikeInterface
 
 from src.commands import (
     DeleteMonsterCommand,
-    MonsterCommand,
     UpdateMonsterMutedCommand,
     UpdateMonsterPluginParameterCommand,
 )
+from src.commands.batch import CommandBatcher
 from src.config import Configs
 from src.field import MonsterField
 from src.monsters import Monster
@@ -78,7 +77,7 @@ class SideBar:
         self,
         ui_manager: pygame_gui.UIManager,
         monster_field: MonsterField,
-        monster_command_queue: "Queue[MonsterCommand]",
+        monster_command_queue: CommandBatcher,
         monster_info: dict[Type[Monster], MonsterInfo],
     ):
         configs = Configs()
@@ -0,0 +1,75 @@
+import numpy as np
+
+from src.generative import euclidean
+
+MAX_STEPS = 64
+
+
+def recursive_euclidean_rhythm(steps: int, hits: int, rotation: int = 0) -> list[int]:
+    """The recursive implementation the iterative generators replaced."""
+    hits = min(steps, hits)
+
+    if hits == 0 or steps == 0:
+        return [0]
+
+    pattern = []
+    counts = []
+    remainders = []
+    divisor = steps - hits
+    remainders.append(hits)
+    level = 0
+
+    while True:
+        counts.append(divisor // remainders[level])
+        remainders.append(divisor % remainders[level])
+        divisor = remainders[level]
+        level += 1
+        if remainders[level] <= 1:
+            break
+
+    counts.append(divisor)
+
+    def build(level):
+        if level == -1:
+            pattern.append(0)
+        elif level == -2:
+            pattern.append(1)
+        else:
+            for _ in range(0, counts[level]):
+                build(level - 1)
+
+            if remainders[level] != 0:
+                build(level - 2)
+
+    build(level)
+    i = pattern.index(1)
+    i = (i - rotation) % steps
+    pattern = pattern[i:] + pattern[0:i]
+
+    return pattern
+
+
+def test_matches_recursive_implementation():
+    for steps in range(MAX_STEPS + 1):
+        for hits in range(MAX_STEPS + 1):
+            for rotation in range(MAX_STEPS + 1):
+                expected = recursive_euclidean_rhythm(steps, hits, rotation)
+
+                assert euclidean.euclidean_rhythm_simple(steps, hits, rotation) == (
+                    expected
+                )
+
+                array = euclidean.euclidean_rhythm_array(steps, hits, rotation)
+                assert array.dtype == np.int8
+                assert array.tolist() == expected
+
+
+def test_long_patterns():
+    steps = 10000
+    hits = 3333
+
+    rhythm = euclidean.euclidean_rhythm_simple(steps, hits, 17)
+
+    assert len(rhythm) == steps
+    assert sum(rhythm) == hits
+    assert euclidean.euclidean_rhythm_array(steps, hits, 17).tolist() == rhythm
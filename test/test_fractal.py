@@ -0,0 +1,44 @@
+import tracemalloc
+
+from src.generative.fractal import (
+    LogisticMap,
+    OneOverFGenerator,
+    TentMap,
+    one_over_f,
+)
+
+
+def test_generator_matches_one_over_f():
+    for source in [LogisticMap(4), TentMap()]:
+        generator = OneOverFGenerator(source, 8)
+        x, r = 0.0, 0.4
+        expected = []
+        for _ in range(100):
+            x, r = one_over_f(x, 0.75, r, source)
+            expected.append((x, r))
+
+        values = []
+        x, r = 0.0, 0.4
+        for count in [1, 32, 67]:
+            block, states = generator.generate(count, x, 0.75, r)
+            values.extend(zip(block.tolist(), states.tolist()))
+            x, r = block[-1].item(), states[-1].item()
+
+        assert values == expected
+
+
+def test_generator_reuses_its_buffers():
+    generator = OneOverFGenerator(capacity=256)
+    values = generator.values
+    block, states = generator.generate(256, 0.0, 0.75, 0.4)
+    assert len(block) == len(states) == 256
+
+    tracemalloc.start()
+    for _ in range(100):
+        generator.generate(256, 0.1, 0.75, 0.4)
+    allocated, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # Only the views of the buffers that are returned are allocated
+    assert generator.values is values
+    assert peak - allocated < 1024
@@ -0,0 +1,101 @@
+import random
+from queue import SimpleQueue
+
+from src.clock import Clock
+from src.commands import LatencyStatsCommand
+from src.soundengine.backend import NullBackend
+from src.soundengine.latency import (
+    MAX_VALUE,
+    LatencyHistogram,
+    LatencyStats,
+    bucket_index,
+    bucket_range,
+)
+from src.soundengine.soundengine import SoundEngine
+
+
+def test_buckets_cover_every_value():
+    previous = -1
+    for value in range(1 << 16):
+        index = bucket_index(value)
+        low, high = bucket_range(index)
+
+        assert low <= value <= high
+        assert index in (previous, previous + 1)
+        previous = index
+
+    low, high = bucket_range(bucket_index(MAX_VALUE))
+    assert high == MAX_VALUE
+
+
+def test_percentiles_are_within_bucket_precision():
+    rng = random.Random(0)
+    values = [int(rng.expovariate(1 / 3000)) for _ in range(20000)]
+    histogram = LatencyHistogram()
+    for value in values:
+        histogram.record(value)
+
+    values.sort()
+    for percentile in (50, 90, 99):
+        exact = values[round(percentile / 100 * len(values)) - 1]
+        assert abs(histogram.percentile(percentile) - exact) <= exact / 64 + 1
+
+    assert histogram.max == values[-1]
+    assert histogram.percentile(100) == values[-1]
+    # Thresholds on the edge of a bucket are counted exactly
+    threshold = bucket_range(bucket_index(10000))[1]
+    assert histogram.count_above(threshold) == sum(
+        value > threshold for value in values
+    )
+
+
+def test_values_just_above_the_threshold_are_counted():
+    histogram = LatencyHistogram()
+    histogram.record(4000)
+    histogram.record(5001)
+    # 5000 and 5001 fall into the same bucket
+    assert bucket_index(5000) == bucket_index(5001)
+    assert histogram.count_above(5000) == 1
+    assert histogram.count_above(5001) == 1
+    assert histogram.count_above(bucket_range(bucket_index(5001))[1]) == 0
+
+
+def test_stats_are_kept_per_channel():
+    stats = LatencyStats()
+    for _ in range(99):
+        stats.record(2, 0.0001)
+    stats.record(2, 0.020)
+    stats.record(5, 0.100)
+
+    summary = stats.summary(10)
+    assert summary[2]["notes"] == 100
+    assert summary[2]["p50"] == 0.1
+    assert summary[2]["max"] == 20.0
+    assert summary[2]["late"] == 1
+    assert summary[5] == {
+        "notes": 1,
+        "p50": 100.0,
+        "p99": 100.0,
+        "max": 100.0,
+        "late": 1,
+    }
+    assert stats.total().total == 101
+
+
+def test_stats_command_sends_back_a_report():
+    engine = SoundEngine(NullBackend(), Clock(80, 4, 4))
+    engine.replies = SimpleQueue()
+    LatencyStatsCommand(10).execute(engine)
+    assert engine.replies.get_nowait() is None
+
+    engine.onsets = LatencyStats()
+    engine.onsets.record(3, 0.002)
+    engine.onsets.record(3, 0.050)
+    LatencyStatsCommand(10).execute(engine)
+
+    report = engine.replies.get_nowait()
+    assert report.threshold == 10
+    assert report.channels[3]["p99"] == 50.0
+    assert report.channels[3]["late"] == 1
+    assert report.total["notes"] == 2
+    assert report.text().splitlines()[1].startswith("  channel 3: 2 notes")
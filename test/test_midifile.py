@@ -0,0 +1,72 @@
+import pytest
+
+from src.soundengine.midifile import END_OF_TRACK, PERCUSSION_CHANNEL, MidiFileWriter
+
+
+def written(tmp_path, writer: MidiFileWriter) -> bytes:
+    writer.close()
+    return (tmp_path / "notes.mid").read_bytes()
+
+
+def test_notes_and_velocities_are_clamped(tmp_path):
+    writer = MidiFileWriter(str(tmp_path / "notes.mid"))
+    writer.note_on(0.0, 0, 140, 128)
+    writer.note_on(1.0, 0, -3, 0)
+    writer.note_off(2.0, 0, 140)
+
+    data = written(tmp_path, writer)
+    assert bytes([0x90, 127, 127]) in data
+    assert bytes([0x90, 0, 1]) in data
+    assert bytes([0x80, 127, 0]) in data
+
+
+def test_percussion_bank_plays_on_percussion_channel(tmp_path):
+    writer = MidiFileWriter(str(tmp_path / "notes.mid"))
+    writer.program_change(0.0, 2, 128, 13)
+    writer.program_change(0.0, 1, 1, 4)
+    writer.note_on(0.0, 2, 36, 100)
+
+    data = written(tmp_path, writer)
+    # No bank select is written for the drum kit
+    assert bytes([0xB0 | PERCUSSION_CHANNEL, 0]) not in data
+    assert bytes([0xC0 | PERCUSSION_CHANNEL, 13]) in data
+    assert bytes([0x90 | PERCUSSION_CHANNEL, 36, 100]) in data
+    assert bytes([0xB1, 0, 1, 0x00, 0xC1, 4]) in data
+
+
+def test_file_is_written_while_playing(tmp_path):
+    writer = MidiFileWriter(str(tmp_path / "notes.mid"), flush_size=16)
+    for beat in range(10):
+        writer.note_on(beat, 0, 60, 100)
+        writer.note_off(beat + 0.5, 0, 60)
+
+    # The events flushed so far can be read before the writer is closed
+    data = (tmp_path / "notes.mid").read_bytes()
+    length = int.from_bytes(data[18:22], "big")
+    assert data[:4] == b"MThd" and data[14:18] == b"MTrk"
+    assert 16 <= length == len(data) - 22
+
+    data = written(tmp_path, writer)
+    assert data.endswith(END_OF_TRACK)
+    assert int.from_bytes(data[18:22], "big") == len(data) - 22
+
+
+def test_drum_kits_share_the_first_kit(tmp_path):
+    writer = MidiFileWriter(str(tmp_path / "notes.mid"))
+    writer.program_change(0.0, 2, 128, 13)
+    writer.program_change(0.0, 3, 128, 6)
+    writer.note_on(0.0, 3, 38, 100)
+
+    data = written(tmp_path, writer)
+    assert bytes([0xC0 | PERCUSSION_CHANNEL, 6]) not in data
+    assert bytes([0x90 | PERCUSSION_CHANNEL, 38, 100]) in data
+
+
+def test_time_signature_denominator_is_a_power_of_two(tmp_path):
+    writer = MidiFileWriter(str(tmp_path / "notes.mid"))
+    writer.set_time_signature(0.0, 7, 8)
+    with pytest.raises(ValueError):
+        writer.set_time_signature(1.0, 4, 3)
+
+    data = written(tmp_path, writer)
+    assert b"\xff\x58\x04" + bytes([7, 3, 24, 8]) in data
@@ -0,0 +1,64 @@
+from src.clock import Clock
+from src.monsters.monsterrepository import MonsterRepository
+from src.soundengine.scene import MONSTER_TYPES
+from src.soundengine.scheduler import ActiveNotePool
+
+
+def test_monsters_do_not_share_state():
+    for monster_type in MONSTER_TYPES.values():
+        first = monster_type((0.25, 0.25))
+        second = monster_type((0.75, 0.75))
+
+        assert first.plugins is not second.plugins
+        assert first.plugin_parameters is not second.plugin_parameters
+        assert first.lookahead is not second.lookahead
+
+        first.initialize(3.5)
+        assert first.initialized and not second.initialized
+        assert second.last_beat == 0.0
+
+        first.add_plugin(first.plugins[0])
+        assert len(first.plugins) == len(second.plugins) + 1
+
+
+def test_monsters_have_no_instance_dict():
+    for monster_type in MONSTER_TYPES.values():
+        monster = monster_type((0.5, 0.5))
+
+        assert not hasattr(monster, "__dict__")
+        for plugin in monster.plugins:
+            assert not hasattr(plugin, "__dict__")
+
+
+def test_repository_holds_many_monsters():
+    repository = MonsterRepository()
+    monster_types = list(MONSTER_TYPES.values())
+
+    for monster_id in range(12000):
+        monster_type = monster_types[monster_id % len(monster_types)]
+        assert repository.add_monster(monster_type((0.5, 0.5))) == monster_id
+
+    assert len(repository.monsters) == 12000
+    assert repository.get_monster(11999) is not repository.get_monster(11991)
+
+
+def test_lookahead_stays_within_window():
+    for monster_type in MONSTER_TYPES.values():
+        for lookahead_beats in [0.5, 2.0, 8.0]:
+            time = [0.0]
+            clock = Clock(80, 4, 4, time=lambda: time[0])
+            monster = monster_type((0.4, 0.6))
+            monster.initialize(0.0)
+            sounds = ActiveNotePool()
+
+            for _ in range(400):
+                time[0] += 0.05
+                beat = clock.tick()
+                monster.generate_next_sound(clock, lookahead_beats)
+
+                # Only the sound that reaches the window starts past it
+                until_beat = beat + lookahead_beats
+                assert sum(entry.init >= until_beat for entry in monster.lookahead) == 1
+
+                while monster.play_sound(beat, sounds, 0) >= 0:
+                    sounds.pop_due(1e9)
@@ -0,0 +1,156 @@
+import io
+from contextlib import redirect_stdout
+from multiprocessing import Queue
+
+import pygame
+
+from src.commands.batch import CommandBatcher
+from src.field import MonsterField
+from src.monsters.draggable import DraggableMonster
+from src.monsters.fractalmonster import EtherealEcho
+from src.soundengine.activity import ActivityTable
+from src.ui.profiler import FrameProfiler
+from src.ui.renderer import BACKGROUND, DirtyRectRenderer
+
+
+class StaticUI:
+    def __init__(self, rects=(), dragging=False):
+        self.rects = None if rects is None else list(rects)
+        self.is_dragging = dragging
+
+    def changed_rects(self):
+        return self.rects
+
+    def dragging(self):
+        return self.is_dragging
+
+
+class Field:
+    def __init__(self, monsters):
+        self.monsters = monsters
+
+    def dirty_rects(self):
+        rects = []
+        for monster in self.monsters:
+            rects.extend(monster.dirty_rects())
+        return rects
+
+
+def make_monster(position) -> DraggableMonster:
+    image = pygame.Surface((10, 10))
+    return DraggableMonster(EtherealEcho, image, image.copy(), position)
+
+
+def test_monster_is_dirty_only_when_it_changes():
+    screen = pygame.Surface((100, 100))
+    monster = make_monster((10, 10))
+    assert monster.dirty_rects() == [pygame.Rect(10, 10, 10, 10)]
+
+    monster.render(screen)
+    monster.set_active(False)
+    monster.position = (10, 10)
+    assert not monster.dirty
+    assert monster.dirty_rects() == []
+
+    monster.set_active(True)
+    monster.position = (30, 40)
+    assert monster.dirty_rects() == [
+        pygame.Rect(10, 10, 10, 10),
+        pygame.Rect(30, 40, 10, 10),
+    ]
+
+
+def test_renderer_merges_overlapping_rects():
+    screen = pygame.Surface((100, 100))
+    monsters = [make_monster((0, 0)), make_monster((5, 5)), make_monster((50, 50))]
+    renderer = DirtyRectRenderer((100, 100))
+
+    # The first frame redraws everything
+    assert renderer.dirty_rects(Field(monsters), StaticUI()) is None
+    for monster in monsters:
+        monster.render(screen)
+    assert renderer.dirty_rects(Field(monsters), StaticUI()) == []
+
+    monsters[0].set_active(True)
+    monsters[1].set_active(True)
+    monsters[2].set_active(True)
+    rects = renderer.dirty_rects(Field(monsters), StaticUI([pygame.Rect(95, 0, 10, 5)]))
+    assert sorted(rects) == [
+        pygame.Rect(0, 0, 15, 15),
+        pygame.Rect(50, 50, 10, 10),
+        pygame.Rect(95, 0, 5, 5),
+    ]
+
+
+def test_renderer_falls_back_to_full_redraw():
+    renderer = DirtyRectRenderer((100, 100))
+    field = Field([])
+    renderer.dirty_rects(field, StaticUI())
+
+    # Elements of the UI were shown or hidden
+    assert renderer.dirty_rects(field, StaticUI(None)) is None
+    # Most of the screen changed
+    assert renderer.dirty_rects(field, StaticUI([pygame.Rect(0, 0, 80, 80)])) is None
+
+    # A monster is dragged from the bottom bar, and dropped
+    assert renderer.dirty_rects(field, StaticUI(dragging=True)) is None
+    assert renderer.dirty_rects(field, StaticUI()) is None
+    assert renderer.dirty_rects(field, StaticUI()) == []
+
+    renderer.invalidate()
+    assert renderer.dirty_rects(field, StaticUI()) is None
+
+
+def test_removed_monster_is_cleared():
+    activity = ActivityTable(4)
+    screen = pygame.Surface((100, 100))
+    renderer = DirtyRectRenderer((100, 100))
+    try:
+        # Every monster added is printed
+        with redirect_stdout(io.StringIO()):
+            field = MonsterField(CommandBatcher(Queue()), activity)
+            kept, removed = make_monster((0, 0)), make_monster((50, 50))
+            field.add_monster(kept)
+            field.add_monster(removed)
+
+        assert renderer.dirty_rects(field, StaticUI()) is None
+        screen.fill(BACKGROUND)
+        field.render(screen)
+        assert renderer.dirty_rects(field, StaticUI()) == []
+
+        field.remove_monster(removed.monster_id)
+        rects = renderer.dirty_rects(field, StaticUI())
+        assert rects == [pygame.Rect(50, 50, 10, 10)]
+        for rect in rects:
+            screen.fill(BACKGROUND, rect)
+        field.render(screen, rects)
+        assert screen.get_at((55, 55)) == pygame.Color(BACKGROUND)
+        assert screen.get_at((5, 5)) == pygame.Color("#000000")
+
+        # The area is only cleared once
+        assert renderer.dirty_rects(field, StaticUI()) == []
+    finally:
+        activity.close()
+
+
+def test_profiler_overlay_is_redrawn_only_where_it_changed():
+    pygame.font.init()
+    profiler = FrameProfiler(1000 / 60)
+    assert profiler.dirty_rects() == []
+
+    profiler.toggle()
+    shown = profiler.dirty_rects()
+    assert shown == [profiler.rect]
+    profiler.end_frame()
+    assert profiler.dirty_rects() == []
+
+    # Only the areas redrawn under the overlay are drawn over
+    screen = pygame.Surface((400, 400))
+    screen.fill(BACKGROUND)
+    profiler.render(screen, [pygame.Rect(0, 0, 20, 20)])
+    assert screen.get_at((10, 10)) != pygame.Color(BACKGROUND)
+    assert screen.get_at((30, 30)) == pygame.Color(BACKGROUND)
+
+    profiler.toggle()
+    assert profiler.dirty_rects() == shown
+    assert profiler.dirty_rects() == []
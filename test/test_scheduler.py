@@ -0,0 +1,100 @@
+import io
+import random
+import tracemalloc
+from contextlib import redirect_stdout
+from multiprocessing import Pipe, SimpleQueue
+from time import perf_counter
+
+from src.clock import Clock
+from src.commands import UpdateClockBpmCommand
+from src.commands.batch import CommandBatcher
+from src.soundengine.backend import NullBackend
+from src.soundengine.scene import MONSTER_TYPES
+from src.soundengine.scheduler import ActiveNotePool
+from src.soundengine.soundengine import MAX_WAIT, SoundEngine
+
+
+def test_releases_in_order():
+    rng = random.Random(0)
+    pool = ActiveNotePool(4)
+    expected = []
+    released = []
+
+    for order in range(5000):
+        init = order * 0.01
+        end = init + rng.choice([0.01, 0.25, 0.5, 1.0])
+        pool.push(order, rng.randrange(8), rng.randrange(128), 100, init, end)
+        expected.append((end, order))
+
+    index = pool.pop_due(1e9)
+    while index >= 0:
+        released.append((pool.ends[index], pool.monster_ids[index]))
+        index = pool.pop_due(1e9)
+
+    assert released == sorted(expected)
+    assert len(pool) == 0
+
+
+def test_steady_state_does_not_allocate():
+    time = [0.0]
+    synth = NullBackend()
+    engine = SoundEngine(
+        synth, Clock(480, 4, 4, time=lambda: time[0]), lookahead_beats=2.0
+    )
+    monster_types = list(MONSTER_TYPES.values())
+    for monster_id in range(40):
+        monster_type = monster_types[monster_id % len(monster_types)]
+        engine.monsters[monster_id] = monster_type(
+            ((monster_id % 9) / 9, (monster_id % 7) / 7)
+        )
+        engine.monsters[monster_id].initialize(0.0)
+
+    def run(iterations: int):
+        for _ in range(iterations):
+            time[0] += 0.01
+            current_beat = engine.generate()
+            engine.release(current_beat)
+            engine.trigger(current_beat)
+            engine.refill()
+
+    # Warm up until the pool and the spare lookahead entries are as large
+    # as they get. Memory is traced from the start, so what is freed later
+    # is taken off.
+    tracemalloc.start()
+    run(10000)
+    noteons = synth.noteons
+
+    before, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+
+    run(5000)
+
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # A single object kept per note would take hundreds of kilobytes.
+    # What is left is the lookahead buffers, which fill up and drain,
+    # and the blocks of sounds being generated.
+    assert synth.noteons - noteons > 10000
+    assert after - before < 16384
+    assert peak - before < 32768
+
+
+def test_commands_wake_up_the_engine():
+    engine = SoundEngine(NullBackend(), Clock(80, 4, 4))
+    queue = SimpleQueue()
+    engine.wakeups, wakeups = Pipe(duplex=False)
+    batcher = CommandBatcher(queue, wakeups)
+
+    batcher.put(UpdateClockBpmCommand(120))
+    batcher.flush()
+    # No event is due, so only the command can wake the engine up this early
+    start = perf_counter()
+    engine.wait_for_next_event(0.0)
+    assert perf_counter() - start < MAX_WAIT / 2
+
+    engine.clear_wakeups()
+    assert not engine.wakeups.poll()
+    with redirect_stdout(io.StringIO()):
+        engine.receive_clock_commands(queue)
+    assert engine.clock.bpm == 120